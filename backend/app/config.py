@@ -1,73 +1,121 @@
 from __future__ import annotations
 
 import os
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
 from typing import Tuple
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+import numpy as np
 
+N_DURATIONS = 20
 
-class Settings(BaseModel):
+
+@lru_cache(maxsize=8)
+def _period_grid(period_min: float, period_max: float, n_periods: int) -> np.ndarray:
+    grid = np.linspace(period_min, period_max, n_periods)
+    grid.flags.writeable = False
+    return grid
+
+
+@lru_cache(maxsize=8)
+def _duration_grid_days(dur_min_hours: float, dur_max_hours: float) -> np.ndarray:
+    grid = np.linspace(dur_min_hours, dur_max_hours, N_DURATIONS) / 24.0
+    grid.flags.writeable = False
+    return grid
+
+
+def _parse_bool(value: str | bool) -> bool:
+    if isinstance(value, bool):
+        return value
+    value_normalized = str(value).strip().lower()
+    return value_normalized in {'1', 'true', 'yes', 'y', 'on'}
+
+
+def _expand_path(value: str | Path) -> Path:
+    return Path(value).expanduser()
+
+
+def _parse_cors(value: str | tuple[str, ...] | list[str] | None) -> Tuple[str, ...]:
+    if value in (None, '', '*', ('*',), ['*']):
+        return ('*',)
+    if isinstance(value, str):
+        items = [item.strip() for item in value.split(',') if item.strip()]
+        return tuple(items) or ('*',)
+    if isinstance(value, (tuple, list)):
+        items = [str(item).strip() for item in value if str(item).strip()]
+        return tuple(items) or ('*',)
+    raise ValueError('Unable to parse ALLOW_CORS value')
+
+
+def _parse_warm_tics(value: str | tuple[int, ...] | list[int] | None) -> Tuple[int, ...]:
+    if value in (None, ''):
+        return ()
+    if isinstance(value, str):
+        value = [item for item in value.split(',') if item.strip()]
+    if isinstance(value, (tuple, list)):
+        return tuple(int(str(item).strip()) for item in value)
+    raise ValueError('Unable to parse WARM_TICS value')
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     """Application configuration sourced from environment variables."""
 
-    model_config = ConfigDict(frozen=True)
-
-    model_dir: Path = Field(default=Path('/data/model'))
-    processed_dir: Path = Field(default=Path('/data/processed'))
-    interim_dir: Path = Field(default=Path('/data/interim'))
-    period_min: float = Field(default=0.5, ge=0.01)
-    period_max: float = Field(default=30.0, gt=0.5)
-    n_periods: int = Field(default=5000, ge=100)
-    dur_min_hours: float = Field(default=0.5, ge=0.1)
-    dur_max_hours: float = Field(default=10.0, ge=0.5)
-    allow_cors: Tuple[str, ...] = Field(default=('*',))
-    log_level: str = Field(default='INFO')
-    auto_fetch_missing: bool = Field(default=False)
-    auto_fetch_author: str | None = Field(default='SPOC')
-    auto_fetch_flux_column: str = Field(default='pdcsap_flux')
-
-    @staticmethod
-    def _parse_bool(value: str | bool) -> bool:
-        if isinstance(value, bool):
-            return value
-        value_normalized = str(value).strip().lower()
-        return value_normalized in {'1', 'true', 'yes', 'y', 'on'}
-
-    @field_validator('model_dir', 'processed_dir', 'interim_dir', mode='before')
-    @classmethod
-    def _expand_path(cls, value: str | Path) -> Path:
-        return Path(value).expanduser()
+    model_dir: Path = Path('/data/model')
+    processed_dir: Path = Path('/data/processed')
+    interim_dir: Path = Path('/data/interim')
+    period_min: float = 0.5
+    period_max: float = 30.0
+    n_periods: int = 5000
+    dur_min_hours: float = 0.5
+    dur_max_hours: float = 10.0
+    allow_cors: Tuple[str, ...] = ('*',)
+    log_level: str = 'INFO'
+    auto_fetch_missing: bool = False
+    auto_fetch_author: str | None = 'SPOC'
+    auto_fetch_flux_column: str = 'pdcsap_flux'
+    warm_tics: Tuple[int, ...] = ()
 
-    @field_validator('allow_cors', mode='before')
-    @classmethod
-    def _parse_cors(cls, value: str | tuple[str, ...] | list[str]) -> Tuple[str, ...]:
-        if value in (None, '', '*', ('*',), ['*']):
-            return ('*',)
-        if isinstance(value, str):
-            items = [item.strip() for item in value.split(',') if item.strip()]
-            return tuple(items) or ('*',)
-        if isinstance(value, (tuple, list)):
-            items = [str(item).strip() for item in value if str(item).strip()]
-            return tuple(items) or ('*',)
-        raise ValueError('Unable to parse ALLOW_CORS value')
+    def __post_init__(self) -> None:
+        if self.period_min < 0.01:
+            raise ValueError('PERIOD_MIN must be >= 0.01')
+        if self.period_max <= 0.5:
+            raise ValueError('PERIOD_MAX must be > 0.5')
+        if self.n_periods < 100:
+            raise ValueError('N_PERIODS must be >= 100')
+        if self.dur_min_hours < 0.1:
+            raise ValueError('DUR_MIN_H must be >= 0.1')
+        if self.dur_max_hours < 0.5:
+            raise ValueError('DUR_MAX_H must be >= 0.5')
+
+    @property
+    def period_grid(self) -> np.ndarray:
+        """Read-only BLS trial periods in days, shared across requests."""
+        return _period_grid(self.period_min, self.period_max, self.n_periods)
+
+    @property
+    def duration_grid_days(self) -> np.ndarray:
+        """Read-only BLS trial durations in days, shared across requests."""
+        return _duration_grid_days(self.dur_min_hours, self.dur_max_hours)
 
     @classmethod
     def from_env(cls) -> 'Settings':
         return cls(
-            model_dir=os.getenv('MODEL_DIR', '/data/model'),
-            processed_dir=os.getenv('PROCESSED_DIR', '/data/processed'),
-            interim_dir=os.getenv('INTERIM_DIR', '/data/interim'),
+            model_dir=_expand_path(os.getenv('MODEL_DIR', '/data/model')),
+            processed_dir=_expand_path(os.getenv('PROCESSED_DIR', '/data/processed')),
+            interim_dir=_expand_path(os.getenv('INTERIM_DIR', '/data/interim')),
             period_min=float(os.getenv('PERIOD_MIN', 0.5)),
             period_max=float(os.getenv('PERIOD_MAX', 30.0)),
             n_periods=int(os.getenv('N_PERIODS', 5000)),
             dur_min_hours=float(os.getenv('DUR_MIN_H', 0.5)),
             dur_max_hours=float(os.getenv('DUR_MAX_H', 10.0)),
-            allow_cors=os.getenv('ALLOW_CORS', '*'),
+            allow_cors=_parse_cors(os.getenv('ALLOW_CORS', '*')),
             log_level=os.getenv('LOG_LEVEL', 'INFO'),
-            auto_fetch_missing=cls._parse_bool(os.getenv('AUTO_FETCH_MISSING', '0')),
+            auto_fetch_missing=_parse_bool(os.getenv('AUTO_FETCH_MISSING', '0')),
             auto_fetch_author=os.getenv('AUTO_FETCH_AUTHOR', 'SPOC') or None,
             auto_fetch_flux_column=os.getenv('AUTO_FETCH_FLUX', 'pdcsap_flux') or 'pdcsap_flux',
+            warm_tics=_parse_warm_tics(os.getenv('WARM_TICS', '')),
         )
 
 
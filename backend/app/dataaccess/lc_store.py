@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Mapping, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from app.config import Settings
 
@@ -16,6 +23,15 @@ except ImportError:  # pragma: no cover - optional dependency
 
 REQUIRED_LC_COLUMNS = {'time', 'flux'}
 OPTIONAL_LC_COLUMNS = {'flux_err'}
+LC_COLUMNS = ('time', 'flux', 'flux_err')
+LC_CACHE_SIZE = 128
+FALLBACK_AUTHORS = ('SPOC', 'QLP', 'TESS-SPOC')
+FALLBACK_FLUX_COLUMNS = ('pdcsap_flux', 'sap_flux', 'flux')
+MAST_SEARCH_WORKERS = 4
+
+# Shared across requests so concurrent fetches never keep more than
+# ``MAST_SEARCH_WORKERS`` MAST queries in flight.
+_MAST_SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=MAST_SEARCH_WORKERS, thread_name_prefix='mast-search')
 
 
 def _resolve_lightcurve_path(settings: Settings, tic_id: int) -> Path:
@@ -26,39 +42,109 @@ def _resolve_cache_path(settings: Settings, tic_id: int) -> Path:
     return settings.interim_dir / 'features' / f'TIC-{tic_id}.parquet'
 
 
-def get_lightcurve_by_tic(settings: Settings, tic_id: int) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
-    path = _resolve_lightcurve_path(settings, tic_id)
-    if not path.exists():
-        raise FileNotFoundError(f'Lightcurve parquet not found for TIC {tic_id} at {path}')
+def _resolve_samples_path(settings: Settings, tic_id: int) -> Path:
+    return settings.interim_dir / 'lightcurve_samples' / f'TIC-{tic_id}.npz'
 
-    df = pd.read_parquet(path)
-    missing = REQUIRED_LC_COLUMNS - set(df.columns)
+
+@lru_cache(maxsize=LC_CACHE_SIZE)
+def _load_lightcurve_cached(
+    path_str: str,
+    mtime_ns: int,
+    size: int,
+) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """Decode a lightcurve parquet once per (path, mtime, size) and freeze the arrays."""
+    # Memory-mapping skips the read() copy into userspace; decoded columns own
+    # their buffers, so cached arrays never pin the mapping.
+    parquet_file = pq.ParquetFile(path_str, memory_map=True)
+    available = set(parquet_file.schema_arrow.names)
+    missing = REQUIRED_LC_COLUMNS - available
     if missing:
         raise ValueError(f'Lightcurve parquet missing required columns: {missing}')
 
-    time = df['time'].to_numpy(copy=True)
-    flux = df['flux'].to_numpy(copy=True)
+    columns = [name for name in LC_COLUMNS if name in available]
+    table = parquet_file.read(columns=columns)
+    time = table.column('time').to_numpy()
+    flux = table.column('flux').to_numpy()
     flux_err = None
-    if 'flux_err' in df.columns:
-        flux_err = df['flux_err'].to_numpy(copy=True)
+    if 'flux_err' in available:
+        flux_err = table.column('flux_err').to_numpy()
+    for arr in (time, flux, flux_err):
+        if arr is not None:
+            arr.setflags(write=False)
     return time, flux, flux_err
 
 
-def read_cached_features(settings: Settings, tic_id: int) -> Optional[pd.Series]:
+def get_lightcurve_by_tic(settings: Settings, tic_id: int) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """Return read-only (time, flux, flux_err) arrays, shared between callers until the file changes."""
+    path = _resolve_lightcurve_path(settings, tic_id)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f'Lightcurve parquet not found for TIC {tic_id} at {path}') from None
+    return _load_lightcurve_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _pandas_index_columns(table: pa.Table) -> set[str]:
+    metadata = table.schema.pandas_metadata or {}
+    return {name for name in metadata.get('index_columns', []) if isinstance(name, str)}
+
+
+def read_cached_features(settings: Settings, tic_id: int) -> Optional[Dict[str, float]]:
     path = _resolve_cache_path(settings, tic_id)
     if not path.exists():
         return None
-    df = pd.read_parquet(path)
-    if df.empty:
+    table = pq.read_table(path)
+    if table.num_rows == 0:
         return None
-    return df.iloc[0]
+    skip = _pandas_index_columns(table)
+    return {
+        name: float(values[0]) if values[0] is not None else np.nan
+        for name, values in table.slice(0, 1).to_pydict().items()
+        if name not in skip
+    }
 
 
-def write_cached_features(settings: Settings, tic_id: int, features: pd.Series) -> None:
+def write_cached_features(settings: Settings, tic_id: int, features: Mapping[str, float]) -> None:
     path = _resolve_cache_path(settings, tic_id)
     path.parent.mkdir(parents=True, exist_ok=True)
-    df = features.to_frame().T
-    df.to_parquet(path, index=False)
+    table = pa.Table.from_pydict({
+        str(key): pa.array([value], type=pa.float64()) for key, value in features.items()
+    })
+    pq.write_table(table, path, compression='zstd')
+
+
+def _lightcurve_stamp(settings: Settings, tic_id: int) -> Optional[Tuple[int, int]]:
+    try:
+        stat = _resolve_lightcurve_path(settings, tic_id).stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_cached_samples(settings: Settings, tic_id: int) -> Optional[Dict[str, np.ndarray]]:
+    """Return the cached downsampled lightcurve, or None if missing or older than the parquet."""
+    path = _resolve_samples_path(settings, tic_id)
+    if not path.exists():
+        return None
+    stamp = _lightcurve_stamp(settings, tic_id)
+    if stamp is None:
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        if tuple(int(v) for v in data['source_stamp']) != stamp:
+            return None
+        return {name: data[name] for name in LC_COLUMNS if name in data.files}
+
+
+def write_cached_samples(settings: Settings, tic_id: int, samples: Mapping[str, np.ndarray]) -> None:
+    stamp = _lightcurve_stamp(settings, tic_id)
+    if stamp is None:
+        return
+    path = _resolve_samples_path(settings, tic_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename so concurrent readers never see a partial archive.
+    tmp_path = path.with_name(f'{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp.npz')
+    np.savez(tmp_path, source_stamp=np.asarray(stamp, dtype=np.int64), **samples)
+    os.replace(tmp_path, path)
 
 
 def _to_numpy(values: np.ndarray) -> np.ndarray:
@@ -71,67 +157,74 @@ def fetch_lightcurve_from_mast(settings: Settings, tic_id: int, sector: int | No
     if search_lightcurve is None or LightkurveError is None:
         raise RuntimeError('lightkurve is required for automatic lightcurve fetching')
 
-    authors = [settings.auto_fetch_author, 'SPOC', 'QLP', 'TESS-SPOC', None]
-    authors = [a for a in authors if a is not None]
-    authors.append(None)
-    seen_authors: set[str | None] = set()
-    authors_ordered: list[str | None] = []
-    for author in authors:
-        if author not in seen_authors:
-            seen_authors.add(author)
-            authors_ordered.append(author)
-
-    flux_columns = [settings.auto_fetch_flux_column, 'pdcsap_flux', 'sap_flux', 'flux']
-    seen_flux: set[str] = set()
-    flux_ordered: list[str] = []
-    for column in flux_columns:
-        if column and column not in seen_flux:
-            seen_flux.add(column)
-            flux_ordered.append(column)
+    # ``None`` (any author) is always the last resort.
+    authors_ordered: list[str | None] = list(dict.fromkeys(
+        [author for author in (settings.auto_fetch_author, *FALLBACK_AUTHORS) if author is not None] + [None]
+    ))
+    flux_ordered: list[str] = list(dict.fromkeys(
+        column for column in (settings.auto_fetch_flux_column, *FALLBACK_FLUX_COLUMNS) if column
+    ))
 
     last_exc: Exception | None = None
 
-    for author in authors_ordered:
-        search = search_lightcurve(
+    # The searches are independent round-trips, so issue them together but
+    # still consume them in priority order; leftovers are cancelled on exit.
+    searches = [
+        _MAST_SEARCH_EXECUTOR.submit(
+            search_lightcurve,
             f'TIC {tic_id}',
             mission='TESS',
             sector=sector,
             author=author,
         )
-        if len(search) == 0:
-            continue
+        for author in authors_ordered
+    ]
+    try:
+        for future in searches:
+            search = future.result()
+            if len(search) == 0:
+                continue
 
-        for flux_column in flux_ordered:
-            try:
-                collection = search.download_all(download_dir=None, flux_column=flux_column)
-                if collection is None or len(collection) == 0:
-                    continue
-                lc = collection.stitch().remove_nans()
-                df = pd.DataFrame({
-                    'time': _to_numpy(lc.time.value),
-                    'flux': _to_numpy(lc.flux.value),
-                })
-                if getattr(lc, 'flux_err', None) is not None:
-                    df['flux_err'] = _to_numpy(lc.flux_err.value)
-                df = df.replace([np.inf, -np.inf], np.nan).dropna()
-                if len(df) < 200:
+            for flux_column in flux_ordered:
+                try:
+                    collection = search.download_all(download_dir=None, flux_column=flux_column)
+                    if collection is None or len(collection) == 0:
+                        continue
+                    lc = collection.stitch().remove_nans()
+                    df = pd.DataFrame({
+                        'time': _to_numpy(lc.time.value),
+                        'flux': _to_numpy(lc.flux.value),
+                    })
+                    if getattr(lc, 'flux_err', None) is not None:
+                        df['flux_err'] = _to_numpy(lc.flux_err.value)
+                    df = df.replace([np.inf, -np.inf], np.nan).dropna()
+                    if len(df) < 200:
+                        continue
+                    output_path = _resolve_lightcurve_path(settings, tic_id)
+                    output_path.parent.mkdir(parents=True, exist_ok=True)
+                    df.to_parquet(
+                        output_path,
+                        index=False,
+                        compression='zstd',
+                        use_dictionary=False,
+                        column_encoding=dict.fromkeys(df.columns, 'BYTE_STREAM_SPLIT'),
+                    )
+                    return output_path
+                except LightkurveError as exc:  # pragma: no cover - network/io heavy
+                    message = str(exc)
+                    marker = 'Data product '
+                    if marker in message:
+                        try:
+                            part = message.split(marker, 1)[1].split(' of type', 1)[0].strip()
+                            cache_path = Path(part).parent
+                            shutil.rmtree(cache_path, ignore_errors=True)
+                        except Exception:
+                            pass
+                    last_exc = exc
                     continue
-                output_path = _resolve_lightcurve_path(settings, tic_id)
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                df.to_parquet(output_path, index=False)
-                return output_path
-            except LightkurveError as exc:  # pragma: no cover - network/io heavy
-                message = str(exc)
-                marker = 'Data product '
-                if marker in message:
-                    try:
-                        part = message.split(marker, 1)[1].split(' of type', 1)[0].strip()
-                        cache_path = Path(part).parent
-                        shutil.rmtree(cache_path, ignore_errors=True)
-                    except Exception:
-                        pass
-                last_exc = exc
-                continue
+    finally:
+        for future in searches:
+            future.cancel()
 
     if last_exc is not None:
         raise RuntimeError(
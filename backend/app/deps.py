@@ -21,3 +21,12 @@ def get_inference_service() -> InferenceService:
             if _service is None:
                 _service = InferenceService(get_settings())
     return _service
+
+
+def close_inference_service() -> None:
+    """Stop the shared service's watcher; the next request builds a fresh service."""
+    global _service
+    with _service_lock:
+        service, _service = _service, None
+    if service is not None:
+        service.close()
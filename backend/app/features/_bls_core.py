@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import math
+import os
+import threading
+from typing import NamedTuple
+
+import numpy as np
+from astropy.timeseries import BoxLeastSquares
+
+try:  # pragma: no cover - optional import
+    import numba  # type: ignore
+    from numba import njit, prange  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    numba = None  # type: ignore
+    njit = None  # type: ignore
+    prange = range  # type: ignore
+
+if numba is not None and 'NUMBA_THREADING_LAYER_PRIORITY' not in os.environ:
+    # Kernels run on request threads; TBB hangs interpreter shutdown after
+    # parallel launches from non-main threads, so prefer OpenMP/workqueue.
+    numba.config.THREADING_LAYER_PRIORITY = ['omp', 'workqueue', 'tbb']
+
+DEFAULT_OVERSAMPLE = 10
+
+# Numba's workqueue threading layer aborts on concurrent parallel launches;
+# OpenMP and TBB do not. The layer is only known after the first launch, so
+# that launch holds the lock and decides whether later ones still need it.
+_KERNEL_LOCK = threading.Lock()
+_serialise_launches = True
+
+
+class BLSPower(NamedTuple):
+    """Subset of ``BoxLeastSquaresResults`` consumed by the feature pipeline."""
+
+    period: np.ndarray
+    power: np.ndarray
+    depth: np.ndarray
+    duration: np.ndarray
+    transit_time: np.ndarray
+
+
+def _bls_power_loop(
+    t: np.ndarray,
+    y: np.ndarray,
+    ivar: np.ndarray,
+    periods: np.ndarray,
+    durations: np.ndarray,
+    oversample: int,
+):
+    """Port of astropy's ``run_bls`` (likelihood objective), parallel over periods."""
+    n_periods = periods.size
+    power = np.full(n_periods, -np.inf)
+    depth = np.full(n_periods, np.nan)
+    best_duration = np.full(n_periods, np.nan)
+    phase = np.full(n_periods, np.nan)
+
+    min_duration = durations.min()
+    bin_duration = min_duration / oversample
+    dur_bins = np.empty(durations.size, dtype=np.int64)
+    for k in range(durations.size):
+        dur_bins[k] = np.int64(math.floor(durations[k] / bin_duration + 0.5))
+
+    min_t = np.inf
+    sum_y = 0.0
+    sum_ivar = 0.0
+    for i in range(t.size):
+        min_t = min(min_t, t[i])
+        sum_y += y[i] * ivar[i]
+        sum_ivar += ivar[i]
+
+    eps = np.finfo(np.float64).eps
+    for p in prange(n_periods):
+        period = periods[p]
+        n_bins = np.int64(math.ceil(period / bin_duration)) + oversample
+        mean_y = np.zeros(n_bins + 1)
+        mean_ivar = np.zeros(n_bins + 1)
+
+        # Bin the folded light curve on a fine phase grid.
+        for n in range(t.size):
+            x = t[n] - min_t
+            wrapped = x - period * math.floor(x / period)
+            ind = np.int64(wrapped / bin_duration) + 1
+            mean_y[ind] += y[n] * ivar[n]
+            mean_ivar[ind] += ivar[n]
+
+        # Pad with the first ``oversample`` bins so windows can wrap around.
+        ind = n_bins - oversample
+        for n in range(1, oversample + 1):
+            mean_y[ind] = mean_y[n]
+            mean_ivar[ind] = mean_ivar[n]
+            ind += 1
+
+        for n in range(1, n_bins + 1):
+            mean_y[n] += mean_y[n - 1]
+            mean_ivar[n] += mean_ivar[n - 1]
+
+        for k in range(durations.size):
+            dur = dur_bins[k]
+            for n in range(n_bins - dur + 1):
+                y_in = mean_y[n + dur] - mean_y[n]
+                ivar_in = mean_ivar[n + dur] - mean_ivar[n]
+                y_out = sum_y - y_in
+                ivar_out = sum_ivar - ivar_in
+                if ivar_in < eps or ivar_out < eps:
+                    continue
+                y_in /= ivar_in
+                y_out /= ivar_out
+                arg = y_out - y_in
+                log_like = 0.5 * ivar_in * arg * arg
+                if y_out >= y_in and log_like > power[p]:
+                    power[p] = log_like
+                    depth[p] = arg
+                    best_duration[p] = dur * bin_duration
+                    phase[p] = np.fmod(n * bin_duration + 0.5 * best_duration[p] + min_t, period)
+
+    return power, depth, best_duration, phase
+
+
+if njit is not None:
+    _bls_power_jit = njit(parallel=True, cache=True)(_bls_power_loop)
+else:  # pragma: no cover - exercised only without numba
+    _bls_power_jit = None
+
+
+def limit_kernel_threads(n_threads: int) -> None:
+    """Cap the threads of BLS kernels launched from the calling thread (a no-op without numba).
+
+    Numba's thread count is per calling thread, so pools that launch kernels side by side
+    call this once per worker to keep their combined threads within the core count.
+    """
+    if numba is not None:
+        numba.set_num_threads(max(1, min(n_threads, numba.config.NUMBA_NUM_THREADS)))
+
+
+def _launch(args: tuple):
+    global _serialise_launches
+    if not _serialise_launches:
+        return _bls_power_jit(*args)
+    with _KERNEL_LOCK:
+        result = _bls_power_jit(*args)
+        try:
+            _serialise_launches = numba.threading_layer() == 'workqueue'
+        except ValueError:  # no parallel region has run yet
+            pass
+    return result
+
+
+def bls_power(
+    time: np.ndarray,
+    flux: np.ndarray,
+    dy: np.ndarray | None,
+    periods: np.ndarray,
+    durations: np.ndarray,
+    oversample: int = DEFAULT_OVERSAMPLE,
+) -> BLSPower:
+    """Evaluate the BLS likelihood periodogram like ``BoxLeastSquares.power``.
+
+    Runs a Numba kernel that is parallel across trial periods when Numba is
+    installed, and falls back to astropy's serial implementation otherwise.
+    """
+    periods = np.ascontiguousarray(periods, dtype=np.float64)
+    durations = np.ascontiguousarray(durations, dtype=np.float64)
+    if _bls_power_jit is None:
+        results = BoxLeastSquares(time, flux, dy=dy).power(periods, durations, oversample=oversample)
+        return BLSPower(
+            period=np.asarray(results.period),
+            power=np.asarray(results.power),
+            depth=np.asarray(results.depth),
+            duration=np.asarray(results.duration),
+            transit_time=np.asarray(results.transit_time),
+        )
+
+    if not periods.min() > durations.max():
+        raise ValueError('The maximum transit duration must be shorter than the minimum period')
+
+    t = np.ascontiguousarray(time, dtype=np.float64)
+    y = np.ascontiguousarray(flux, dtype=np.float64)
+    t_ref = float(t.min())
+    if dy is None:
+        ivar = np.ones_like(y)
+    else:
+        ivar = 1.0 / np.ascontiguousarray(dy, dtype=np.float64) ** 2
+
+    args = (t - t_ref, y - np.median(y), ivar, periods, durations, int(oversample))
+    power, depth, duration, phase = _launch(args)
+    return BLSPower(
+        period=periods,
+        power=power,
+        depth=depth,
+        duration=duration,
+        transit_time=phase + t_ref,
+    )
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+try:  # pragma: no cover - optional import
+    from numba import njit  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None  # type: ignore
+
+# Sample groups reported by ``post_bls_stats``.
+IN_TRANSIT, OUT_OF_TRANSIT, ODD, EVEN, BEFORE_T0, AFTER_T0 = range(6)
+N_GROUPS = 6
+
+
+def _label_stats(labels: np.ndarray, values: np.ndarray, n_labels: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-label counts, means and population stds via bincount (no masked copies)."""
+    counts = np.bincount(labels, minlength=n_labels)
+    sums = np.bincount(labels, weights=values, minlength=n_labels)
+    means = np.divide(sums, counts, out=np.zeros(n_labels), where=counts > 0)
+    deviation = values - means[labels]
+    np.square(deviation, out=deviation)
+    sq_dev = np.bincount(labels, weights=deviation, minlength=n_labels)
+    stds = np.sqrt(np.divide(sq_dev, counts, out=np.zeros(n_labels), where=counts > 0))
+    return counts, means, stds
+
+
+def _post_bls_stats_numpy(
+    time: np.ndarray,
+    norm_flux: np.ndarray,
+    mask: np.ndarray,
+    t0: float,
+    period: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    in_transit = mask.astype(np.intp)
+    if period > 0:
+        parity = np.floor((time - t0) / period + 1e-6).astype(np.intp) & 1
+    else:
+        parity = np.zeros(time.size, dtype=np.intp)
+    # 0: out of transit, 1: even transit number (ODD), 2: odd transit number (EVEN).
+    parity_label = in_transit * (parity + 1)
+    # 0: before t0, 1: exactly at t0, 2: after t0.
+    side_label = np.sign(time - t0).astype(np.intp) + 1
+
+    partitions = (
+        _label_stats(in_transit, norm_flux, 2),
+        _label_stats(parity_label, norm_flux, 3),
+        _label_stats(side_label, norm_flux, 3),
+    )
+    cells = (
+        (IN_TRANSIT, 0, 1),
+        (OUT_OF_TRANSIT, 0, 0),
+        (ODD, 1, 1),
+        (EVEN, 1, 2),
+        (BEFORE_T0, 2, 0),
+        (AFTER_T0, 2, 2),
+    )
+    counts = np.zeros(N_GROUPS, dtype=np.int64)
+    means = np.zeros(N_GROUPS, dtype=np.float64)
+    stds = np.zeros(N_GROUPS, dtype=np.float64)
+    for group, partition, label in cells:
+        part_counts, part_means, part_stds = partitions[partition]
+        counts[group] = part_counts[label]
+        means[group] = part_means[label]
+        stds[group] = part_stds[label]
+    return counts, means, stds
+
+
+def _sample_groups(t: float, in_transit: bool, t0: float, period: float) -> Tuple[int, int, int]:
+    if in_transit:
+        parity = np.int64(np.floor((t - t0) / period + 1e-6)) % 2 if period > 0 else 0
+        transit_group = IN_TRANSIT
+        parity_group = EVEN if parity == 1 else ODD
+    else:
+        transit_group = OUT_OF_TRANSIT
+        parity_group = -1
+    if t < t0:
+        side_group = BEFORE_T0
+    elif t > t0:
+        side_group = AFTER_T0
+    else:
+        side_group = -1
+    return transit_group, parity_group, side_group
+
+
+def _post_bls_stats_loop(
+    time: np.ndarray,
+    norm_flux: np.ndarray,
+    mask: np.ndarray,
+    t0: float,
+    period: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    counts = np.zeros(N_GROUPS, dtype=np.int64)
+    sums = np.zeros(N_GROUPS, dtype=np.float64)
+    for i in range(time.size):
+        for g in _sample_groups(time[i], mask[i], t0, period):
+            if g >= 0:
+                counts[g] += 1
+                sums[g] += norm_flux[i]
+
+    means = np.zeros(N_GROUPS, dtype=np.float64)
+    for g in range(N_GROUPS):
+        if counts[g] > 0:
+            means[g] = sums[g] / counts[g]
+
+    # Second pass over squared deviations keeps parity with np.std.
+    sq_dev = np.zeros(N_GROUPS, dtype=np.float64)
+    for i in range(time.size):
+        for g in _sample_groups(time[i], mask[i], t0, period):
+            if g >= 0:
+                delta = norm_flux[i] - means[g]
+                sq_dev[g] += delta * delta
+
+    stds = np.zeros(N_GROUPS, dtype=np.float64)
+    for g in range(N_GROUPS):
+        if counts[g] > 0:
+            stds[g] = np.sqrt(sq_dev[g] / counts[g])
+    return counts, means, stds
+
+
+if njit is not None:
+    _sample_groups = njit(cache=True)(_sample_groups)
+    _post_bls_stats_jit = njit(cache=True, fastmath=True)(_post_bls_stats_loop)
+else:  # pragma: no cover - exercised only without numba
+    _post_bls_stats_jit = None
+
+
+def post_bls_stats(
+    time: np.ndarray,
+    norm_flux: np.ndarray,
+    mask: np.ndarray,
+    t0: float,
+    period: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return per-group ``(counts, means, stds)`` of ``norm_flux`` after BLS.
+
+    Groups are indexed by the module constants: in/out of transit, odd/even
+    transits, and samples before/after ``t0``. Uses a fused Numba kernel when
+    available and falls back to vectorised NumPy otherwise.
+    """
+    if _post_bls_stats_jit is not None:
+        return _post_bls_stats_jit(
+            np.ascontiguousarray(time, dtype=np.float64),
+            np.ascontiguousarray(norm_flux, dtype=np.float64),
+            np.ascontiguousarray(mask, dtype=np.bool_),
+            float(t0),
+            float(period),
+        )
+    return _post_bls_stats_numpy(time, norm_flux, mask, t0, period)
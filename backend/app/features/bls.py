@@ -8,6 +8,16 @@ import pandas as pd
 from astropy.timeseries import BoxLeastSquares
 
 from app.config import Settings
+from app.features._bls_core import bls_power, limit_kernel_threads
+from app.features._bls_kernels import (
+    AFTER_T0,
+    BEFORE_T0,
+    EVEN,
+    IN_TRANSIT,
+    ODD,
+    OUT_OF_TRANSIT,
+    post_bls_stats,
+)
 
 MIN_SAMPLES = 200
 META_FEATURE_KEYS = ('tmag', 'teff', 'rad', 'crowdsap', 'contratio')
@@ -19,14 +29,44 @@ class InsufficientDataError(Exception):
 
 @dataclass
 class BLSResult:
-    features: pd.Series
+    features: Dict[str, float]
     summary: Dict[str, float]
     warnings: List[str]
 
 
-def _mad(values: np.ndarray) -> float:
-    diff = np.abs(values - np.median(values))
-    return np.median(diff)
+def _as_f64(values: Iterable[float]) -> np.ndarray:
+    """Return ``values`` as a float64 array, avoiding copies for array-likes."""
+    if isinstance(values, pd.Series):
+        return values.to_numpy(dtype=np.float64, copy=False)
+    if isinstance(values, (np.ndarray, list, tuple)):
+        return np.asarray(values, dtype=np.float64)
+    return np.fromiter(values, dtype=np.float64)
+
+
+def _sort_by_time(
+    time: np.ndarray,
+    flux: np.ndarray,
+    flux_err: np.ndarray | None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+    # Stored light curves are almost always time-ordered already; skip the sort.
+    if np.all(time[1:] >= time[:-1]):
+        return time, flux, flux_err
+    order = np.argsort(time)
+    sorted_err = np.take(flux_err, order) if flux_err is not None else None
+    return np.take(time, order), np.take(flux, order), sorted_err
+
+
+def _abs_deviation(values: np.ndarray, center: float) -> np.ndarray:
+    diff = np.subtract(values, center)
+    np.fabs(diff, out=diff)
+    return diff
+
+
+def _mad(values: np.ndarray, center: float | None = None) -> float:
+    if center is None:
+        center = float(np.median(values))
+    # The deviation buffer is scratch, so let the median partition it in place.
+    return float(np.median(_abs_deviation(values, center), overwrite_input=True))
 
 
 def _five_sigma_clip(
@@ -34,12 +74,12 @@ def _five_sigma_clip(
     flux: np.ndarray,
     flux_err: np.ndarray | None,
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray | None, float]:
-    median = np.median(flux)
-    mad = _mad(flux)
+    median = float(np.median(flux))
+    mad = _mad(flux, median)
     if mad == 0:
         return time, flux, flux_err, 1.0
     threshold = 5.0 * 1.4826 * mad
-    mask = np.abs(flux - median) <= threshold
+    mask = np.less_equal(_abs_deviation(flux, median), threshold)
     clipped_time = time[mask]
     clipped_flux = flux[mask]
     clipped_err = flux_err[mask] if flux_err is not None else None
@@ -69,29 +109,25 @@ def build_bls_features(
     """Compute BLS-derived features mirroring the training pipeline."""
     warnings: List[str] = []
 
-    time_arr = np.asarray(list(time), dtype=float)
-    flux_arr = np.asarray(list(flux), dtype=float)
-    if flux_err is not None:
-        flux_err_arr = np.asarray(list(flux_err), dtype=float)
-    else:
-        flux_err_arr = None
-
-    finite_mask = np.isfinite(time_arr) & np.isfinite(flux_arr)
-    if flux_err_arr is not None:
-        finite_mask &= np.isfinite(flux_err_arr)
-    time_arr = time_arr[finite_mask]
-    flux_arr = flux_arr[finite_mask]
-    if flux_err_arr is not None:
-        flux_err_arr = flux_err_arr[finite_mask]
-
-    if time_arr.size < MIN_SAMPLES:
+    time_arr = _as_f64(time)
+    flux_arr = _as_f64(flux)
+    flux_err_arr = _as_f64(flux_err) if flux_err is not None else None
+
+    finite_mask = np.isfinite(time_arr)
+    scratch = np.empty_like(finite_mask)
+    for values in (flux_arr, flux_err_arr):
+        if values is not None:
+            np.logical_and(finite_mask, np.isfinite(values, out=scratch), out=finite_mask)
+    n_finite = int(np.count_nonzero(finite_mask))
+    if n_finite < MIN_SAMPLES:
         raise InsufficientDataError('insufficient samples after removing non-finite values')
+    if n_finite < time_arr.size:
+        time_arr = np.compress(finite_mask, time_arr)
+        flux_arr = np.compress(finite_mask, flux_arr)
+        if flux_err_arr is not None:
+            flux_err_arr = np.compress(finite_mask, flux_err_arr)
 
-    order = np.argsort(time_arr)
-    time_arr = time_arr[order]
-    flux_arr = flux_arr[order]
-    if flux_err_arr is not None:
-        flux_err_arr = flux_err_arr[order]
+    time_arr, flux_arr, flux_err_arr = _sort_by_time(time_arr, flux_arr, flux_err_arr)
 
     time_arr, flux_arr, flux_err_arr, fraction_kept = _five_sigma_clip(time_arr, flux_arr, flux_err_arr)
     if time_arr.size < MIN_SAMPLES:
@@ -103,16 +139,17 @@ def build_bls_features(
     if not np.isfinite(median_flux) or median_flux == 0:
         raise ValueError('median flux is invalid for normalization')
 
-    norm_flux = flux_arr / median_flux - 1.0
+    # ``flux_arr`` may still alias the caller's (or the read-only cached) array,
+    # so divide into a fresh buffer and finish the normalisation in place.
+    norm_flux = np.divide(flux_arr, median_flux)
+    np.subtract(norm_flux, 1.0, out=norm_flux)
     if flux_err_arr is not None:
         norm_flux_err = flux_err_arr / median_flux
     else:
         norm_flux_err = None
 
     bls = BoxLeastSquares(time_arr, norm_flux, dy=norm_flux_err)
-    periods = np.linspace(settings.period_min, settings.period_max, settings.n_periods)
-    durations = np.linspace(settings.dur_min_hours, settings.dur_max_hours, 20) / 24.0
-    results = bls.power(periods, durations)
+    results = bls_power(time_arr, norm_flux, norm_flux_err, settings.period_grid, settings.duration_grid_days)
     if results.power.size == 0:
         raise ValueError('BLS did not return any power spectrum results')
 
@@ -153,38 +190,30 @@ def build_bls_features(
     else:
         transit_mask_array = transit_mask_array.astype(bool)
 
-    flux_in = norm_flux[transit_mask_array]
-    flux_out = norm_flux[~transit_mask_array]
-    out_std = np.std(flux_out) if flux_out.size else 0.0
-    in_std = np.std(flux_in) if flux_in.size else 0.0
-    in_vs_out_rms = float((in_std / out_std) if out_std else 1.0)
+    counts, means, stds = post_bls_stats(time_arr, norm_flux, transit_mask_array, best_t0, best_period)
+    out_std = stds[OUT_OF_TRANSIT]
+    in_vs_out_rms = float((stds[IN_TRANSIT] / out_std) if out_std else 1.0)
 
     baseline_days = float(time_arr[-1] - time_arr[0]) if time_arr.size else 0.0
     n_transits = baseline_days / best_period if best_period > 0 else 0.0
     n_transits = float(max(n_transits, 1.0))
 
     if results.power.size > 1:
-        second_idx = int(np.argsort(results.power)[-2])
-        second_best_power = float(results.power[second_idx])
+        # Partial selection: only the second-largest value is needed, not a full sort.
+        second_best_power = float(np.partition(results.power, -2)[-2])
     else:
         second_best_power = 0.0
     secondary_snr = float(second_best_power / results.power[best_idx]) if results.power[best_idx] else 0.0
 
-    if best_period > 0:
-        transit_numbers = np.floor((time_arr - best_t0) / best_period + 1e-6).astype(int)
-    else:
-        transit_numbers = np.zeros_like(time_arr, dtype=int)
-    odd_mask = transit_mask_array & (transit_numbers % 2 == 0)
-    even_mask = transit_mask_array & (transit_numbers % 2 == 1)
-    if odd_mask.any() and even_mask.any():
-        odd_depth = float(np.abs(np.mean(norm_flux[odd_mask])))
-        even_depth = float(np.abs(np.mean(norm_flux[even_mask])))
+    if counts[ODD] and counts[EVEN]:
+        odd_depth = float(np.abs(means[ODD]))
+        even_depth = float(np.abs(means[EVEN]))
         odd_even_depth_ratio = float(odd_depth / even_depth) if even_depth else 1.0
     else:
         odd_even_depth_ratio = 1.0
 
-    rms_before = float(np.std(norm_flux[time_arr < best_t0])) if np.any(time_arr < best_t0) else np.nan
-    rms_after = float(np.std(norm_flux[time_arr > best_t0])) if np.any(time_arr > best_t0) else np.nan
+    rms_before = float(stds[BEFORE_T0]) if counts[BEFORE_T0] else np.nan
+    rms_after = float(stds[AFTER_T0]) if counts[AFTER_T0] else np.nan
 
     duty_cycle = float(best_duration / best_period) if best_period > 0 else 0.0
 
@@ -217,5 +246,8 @@ def build_bls_features(
         't0_btjd': features['t0_btjd'],
     }
 
-    bls_series = pd.Series(features, dtype='float64')
-    return BLSResult(features=bls_series, summary=summary, warnings=warnings)
+    return BLSResult(
+        features={key: float(value) for key, value in features.items()},
+        summary=summary,
+        warnings=warnings,
+    )
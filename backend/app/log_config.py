@@ -1,18 +1,25 @@
 from __future__ import annotations
 
-import json
 import logging
 import sys
 from datetime import datetime, timezone
 from typing import Any, Dict
 
+import orjson
+
+_RESERVED_RECORD_KEYS = frozenset({
+    'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename', 'module', 'exc_info', 'exc_text',
+    'stack_info', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated', 'thread', 'threadName',
+    'processName', 'process',
+})
+
 
 class JsonFormatter(logging.Formatter):
     """Simple JSON log formatter with ISO timestamps."""
 
     def format(self, record: logging.LogRecord) -> str:  # noqa: D401
         payload: Dict[str, Any] = {
-            'ts': datetime.now(timezone.utc).isoformat(),
+            'ts': datetime.fromtimestamp(record.created, timezone.utc),
             'level': record.levelname,
             'logger': record.name,
             'message': record.getMessage(),
@@ -23,12 +30,10 @@ class JsonFormatter(logging.Formatter):
         if isinstance(extra, dict):
             payload.update(extra)
         for key, value in record.__dict__.items():
-            if key.startswith('_') or key in payload:
-                continue
-            if key in {'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename', 'module', 'exc_info', 'exc_text', 'stack_info', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated', 'thread', 'threadName', 'processName', 'process'}:
+            if key[0] == '_' or key in _RESERVED_RECORD_KEYS or key in payload:
                 continue
             payload[key] = value
-        return json.dumps(payload, ensure_ascii=True)
+        return orjson.dumps(payload, default=str, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
 
 
 def configure_logging(level: str = 'INFO') -> None:
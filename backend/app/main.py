@@ -1,11 +1,24 @@
 from __future__ import annotations
 
-from fastapi import Depends, FastAPI, HTTPException, Query
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncIterator
+
+import numpy as np
+import orjson
+import pyarrow as pa
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 
-from app.config import settings
-from app.deps import get_inference_service
-from app.log_config import configure_logging
+from app.config import Settings, settings
+from app.dataaccess import lc_store
+from app.deps import close_inference_service, get_inference_service
+from app.features.bls import build_bls_features
+from app.log_config import configure_logging, get_logger
 from app.models.infer import (
     FeatureExtractionError,
     InferenceService,
@@ -13,7 +26,10 @@ from app.models.infer import (
     LightcurveNotFoundError,
 )
 from app.schemas import (
+    MAX_BATCH_SIZE,
+    BatchPredictionResponse,
     HealthResponse,
+    LightcurveBatchPayload,
     LightcurvePayload,
     ModelInfoResponse,
     PredictionResponse,
@@ -21,8 +37,44 @@ from app.schemas import (
 )
 
 configure_logging(settings.log_level)
+LOGGER = get_logger(__name__)
 
-APP = FastAPI(title='Exoplanet AI Backend', version='1.0.0')
+
+class NumpyJSONResponse(Response):
+    """JSON response rendered by orjson, serialising NumPy arrays without boxing."""
+
+    media_type = 'application/json'
+
+    def render(self, content: object) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Building the service loads the model; that is I/O-bound and BLS warmup is compile-bound,
+    # so overlap them off the event loop.
+    await asyncio.gather(
+        asyncio.to_thread(get_inference_service),
+        asyncio.to_thread(_warmup_bls, settings),
+        asyncio.to_thread(_warm_lightcurves, settings),
+    )
+    try:
+        yield
+    finally:
+        close_inference_service()
+
+
+APP = FastAPI(
+    title='Exoplanet AI Backend',
+    version='1.0.0',
+    default_response_class=NumpyJSONResponse,
+    lifespan=_lifespan,
+)
+
+# Bounded pool for parquet decoding + BLS so CPU-heavy predictions do not
+# oversubscribe cores the way the default 40-thread anyio pool would. Batch
+# items fan out to the model's own pool, whose BLS kernels share the cores.
+PREDICT_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='predict')
 
 cors_origins = list(settings.allow_cors)
 APP.add_middleware(
@@ -34,10 +86,28 @@ APP.add_middleware(
 )
 
 
-@APP.on_event('startup')
-async def _startup() -> None:
-    service = get_inference_service()
-    service.refresh(force=True)
+def _warm_lightcurves(app_settings: Settings) -> None:
+    """Prefetch WARM_TICS lightcurves into the parquet cache concurrently."""
+    tic_ids = app_settings.warm_tics
+    if not tic_ids:
+        return
+    with ThreadPoolExecutor(max_workers=min(8, len(tic_ids)), thread_name_prefix='warm') as pool:
+        futures = {pool.submit(lc_store.get_lightcurve_by_tic, app_settings, tic_id): tic_id for tic_id in tic_ids}
+        for future, tic_id in futures.items():
+            try:
+                future.result()
+            except Exception as exc:
+                LOGGER.warning('warm_tic_failed', extra={'tic_id': tic_id, 'error': str(exc)})
+
+
+def _warmup_bls(app_settings: Settings) -> None:
+    """Run BLS once on a synthetic lightcurve so JIT/grid setup is not paid by the first request."""
+    time = np.linspace(0.0, 27.0, 500)
+    flux = 1.0 + 1e-4 * np.sin(time)
+    try:
+        build_bls_features(app_settings, time, flux)
+    except Exception as exc:
+        LOGGER.warning('bls_warmup_failed', extra={'error': str(exc)})
 
 
 @APP.get('/health', response_model=HealthResponse)
@@ -57,14 +127,18 @@ def model_info(service: InferenceService = Depends(get_inference_service)) -> Mo
     return ModelInfoResponse(**info)
 
 
+# Prediction payloads are built by the service itself (lightcurves as float64
+# ndarrays), so the routes below hand them to orjson directly; ``response_model``
+# documents the shape without re-validating thousands of samples per request.
 @APP.get('/predict/by_tic', response_model=PredictionResponse)
-def predict_by_tic(
+async def predict_by_tic(
     tic_id: int = Query(..., ge=1),
     service: InferenceService = Depends(get_inference_service),
-) -> PredictionResponse:
+) -> NumpyJSONResponse:
+    loop = asyncio.get_running_loop()
     try:
-        payload = service.predict_by_tic(tic_id)
-        return PredictionResponse(**payload)
+        payload = await loop.run_in_executor(PREDICT_EXECUTOR, service.predict_by_tic, tic_id)
+        return NumpyJSONResponse(payload)
     except LightcurveNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc))
     except InsufficientDataError:
@@ -73,25 +147,103 @@ def predict_by_tic(
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+async def _run_prediction(func, *args, **kwargs):
+    """Run a service call on PREDICT_EXECUTOR and map its data errors to HTTP errors."""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(PREDICT_EXECUTOR, partial(func, *args, **kwargs))
+    except InsufficientDataError:
+        raise HTTPException(status_code=422, detail={'message': 'insufficient_data', 'warnings': ['insufficient_data']})
+    except FeatureExtractionError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 @APP.post('/predict/from_lightcurve', response_model=PredictionResponse)
-def predict_from_lightcurve(
+async def predict_from_lightcurve(
     payload: LightcurvePayload,
     service: InferenceService = Depends(get_inference_service),
-) -> PredictionResponse:
+) -> NumpyJSONResponse:
     if len(payload.time) != len(payload.flux):
         raise HTTPException(status_code=400, detail='time and flux length mismatch')
     if payload.flux_err is not None and len(payload.flux_err) != len(payload.time):
         raise HTTPException(status_code=400, detail='flux_err length mismatch')
 
+    response = await _run_prediction(
+        service.predict_from_arrays,
+        time=payload.time,
+        flux=payload.flux,
+        flux_err=payload.flux_err,
+        meta=payload.meta,
+    )
+    return NumpyJSONResponse(response)
+
+
+def _arrow_column(table: pa.Table, name: str) -> np.ndarray | None:
+    if name not in table.column_names:
+        return None
+    column = table.column(name)
+    if column.null_count == len(column):
+        return None
+    return column.to_numpy().astype(np.float64, copy=False)
+
+
+def _read_arrow_batches(body: bytes) -> list[pa.RecordBatch]:
     try:
-        response = service.predict_from_arrays(
-            time=payload.time,
-            flux=payload.flux,
-            flux_err=payload.flux_err,
-            meta=payload.meta,
-        )
-        return PredictionResponse(**response)
-    except InsufficientDataError:
-        raise HTTPException(status_code=422, detail={'message': 'insufficient_data', 'warnings': ['insufficient_data']})
-    except FeatureExtractionError as exc:
-        raise HTTPException(status_code=400, detail=str(exc))
+        return list(pa.ipc.open_stream(body))
+    except (pa.ArrowInvalid, OSError) as exc:
+        raise HTTPException(status_code=400, detail=f'invalid Arrow IPC stream: {exc}')
+
+
+def _arrow_lightcurve(table: pa.Table, where: str = '') -> dict:
+    """Light-curve arrays of one Arrow table, checked like the JSON payloads; ``where`` prefixes errors."""
+    time = _arrow_column(table, 'time')
+    flux = _arrow_column(table, 'flux')
+    if time is None or flux is None:
+        raise HTTPException(status_code=400, detail=f'{where}time and flux columns are required')
+    if time.size < 2:
+        raise HTTPException(status_code=422, detail=f'{where}lightcurve must contain at least two samples')
+    return {'time': time, 'flux': flux, 'flux_err': _arrow_column(table, 'flux_err'), 'meta': None}
+
+
+@APP.post('/predict/from_arrow', response_model=PredictionResponse)
+async def predict_from_arrow(
+    request: Request,
+    service: InferenceService = Depends(get_inference_service),
+) -> NumpyJSONResponse:
+    """Score a light curve sent as an Arrow IPC stream with time, flux and optional flux_err columns."""
+    batches = _read_arrow_batches(await request.body())
+    if not batches:
+        raise HTTPException(status_code=400, detail='Arrow stream contains no record batches')
+    lightcurve = _arrow_lightcurve(pa.Table.from_batches(batches))
+    return NumpyJSONResponse(await _run_prediction(service.predict_from_arrays, **lightcurve))
+
+
+@APP.post('/predict/batch', response_model=BatchPredictionResponse)
+async def predict_batch(
+    payload: LightcurveBatchPayload,
+    service: InferenceService = Depends(get_inference_service),
+) -> NumpyJSONResponse:
+    for idx, item in enumerate(payload.items):
+        if len(item.time) != len(item.flux):
+            raise HTTPException(status_code=400, detail=f'items[{idx}]: time and flux length mismatch')
+        if item.flux_err is not None and len(item.flux_err) != len(item.time):
+            raise HTTPException(status_code=400, detail=f'items[{idx}]: flux_err length mismatch')
+
+    results = await _run_prediction(service.predict_batch, [item.model_dump() for item in payload.items])
+    return NumpyJSONResponse({'results': results})
+
+
+@APP.post('/predict/from_lightcurves', response_model=BatchPredictionResponse)
+async def predict_from_lightcurves(
+    request: Request,
+    service: InferenceService = Depends(get_inference_service),
+) -> NumpyJSONResponse:
+    """Score up to MAX_BATCH_SIZE light curves sent as one Arrow IPC stream, one record batch each."""
+    batches = _read_arrow_batches(await request.body())
+    if not batches:
+        raise HTTPException(status_code=400, detail='Arrow stream contains no record batches')
+    if len(batches) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f'at most {MAX_BATCH_SIZE} light curves per request')
+    items = [_arrow_lightcurve(pa.Table.from_batches([batch]), f'batches[{idx}]: ') for idx, batch in enumerate(batches)]
+    results = await _run_prediction(service.predict_batch, items)
+    return NumpyJSONResponse({'results': results})
@@ -1,21 +1,35 @@
 from __future__ import annotations
 
-import math
+import os
 import threading
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
-import pandas as pd
 
 from app.config import Settings
 from app.dataaccess import lc_store
-from app.features.bls import BLSResult, InsufficientDataError, build_bls_features
+from app.features.bls import BLSResult, InsufficientDataError, build_bls_features, limit_kernel_threads
 from app.log_config import get_logger
 from app.models import loader
 from app.utils_time import elapsed_ms, monotonic_ms
 
 LOGGER = get_logger(__name__)
 
+# How often the background watcher checks latest.txt for a new artifact.
+MODEL_POLL_INTERVAL_S = 5.0
+
+# Feature extraction for /predict/batch items; kept small since BLS itself is parallel.
+BATCH_FEATURE_WORKERS = 4
+# Each worker's BLS kernels get an equal share of the cores, so a full pool uses about
+# os.cpu_count() numba threads rather than BATCH_FEATURE_WORKERS times that.
+_BATCH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=BATCH_FEATURE_WORKERS,
+    thread_name_prefix='batch-features',
+    initializer=limit_kernel_threads,
+    initargs=((os.cpu_count() or 1) // BATCH_FEATURE_WORKERS,),
+)
+
 
 class LightcurveNotFoundError(FileNotFoundError):
     """Raised when a TIC light curve parquet is unavailable."""
@@ -28,11 +42,15 @@ class FeatureExtractionError(RuntimeError):
 class InferenceService:
     """Coordinates artifact loading, feature extraction, and scoring."""
 
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, poll_interval: float = MODEL_POLL_INTERVAL_S) -> None:
         self._settings = settings
         self._lock = threading.RLock()
         self._state: Dict[str, Any] | None = None
+        self._stop = threading.Event()
+        self._poll_interval = poll_interval
         self.refresh(force=True)
+        self._watcher = threading.Thread(target=self._watch_artifacts, name='model-watcher', daemon=True)
+        self._watcher.start()
 
     @property
     def settings(self) -> Settings:
@@ -41,16 +59,36 @@ class InferenceService:
     def refresh(self, force: bool = False) -> Dict[str, Any]:
         with self._lock:
             latest_path = self._settings.model_dir / 'latest.txt'
-            if not latest_path.exists():
-                raise FileNotFoundError(f'latest.txt not found in {self._settings.model_dir}')
-            current_mtime = latest_path.stat().st_mtime
+            try:
+                current_mtime = os.stat(latest_path).st_mtime
+            except FileNotFoundError:
+                raise FileNotFoundError(f'latest.txt not found in {self._settings.model_dir}') from None
             if force or self._state is None or current_mtime > float(self._state.get('latest_mtime', 0.0)):
                 self._state = loader.load_state(self._settings)
             assert self._state is not None
             return self._state
 
+    def close(self) -> None:
+        """Stop the artifact watcher thread and wait for it to exit."""
+        self._stop.set()
+        if self._watcher is not threading.current_thread():
+            self._watcher.join()
+
+    def _watch_artifacts(self) -> None:
+        while not self._stop.wait(self._poll_interval):
+            try:
+                self.refresh()
+            except Exception as exc:  # pragma: no cover - keep serving the loaded model
+                LOGGER.warning('model_refresh_failed', extra={'error': str(exc)})
+
+    def _current_state(self) -> Dict[str, Any]:
+        # Reloads swap ``_state`` wholesale, so readers need neither the lock nor a stat().
+        state = self._state
+        assert state is not None
+        return state
+
     def version_info(self) -> Dict[str, Any]:
-        state = self.refresh()
+        state = self._current_state()
         return {
             'app': 'exoplanet-ai',
             'mode': state['mode'],
@@ -59,7 +97,7 @@ class InferenceService:
         }
 
     def model_info(self) -> Dict[str, Any]:
-        state = self.refresh()
+        state = self._current_state()
         return {
             'mode': state['mode'],
             'latest': state['latest'],
@@ -72,53 +110,56 @@ class InferenceService:
         }
 
     def predict_by_tic(self, tic_id: int) -> Dict[str, Any]:
-        state = self.refresh()
+        state = self._current_state()
         start_ms = monotonic_ms()
         cache_hit = False
         auto_fetch = False
 
-        try:
-            time_arr, flux_arr, flux_err_arr = lc_store.get_lightcurve_by_tic(self._settings, tic_id)
-        except FileNotFoundError as exc:
-            if not self._settings.auto_fetch_missing:
-                raise LightcurveNotFoundError(str(exc)) from exc
+        # A feature hit with a fresh downsampled payload needs nothing from the parquet.
+        cached_features = lc_store.read_cached_features(self._settings, tic_id)
+        samples = lc_store.read_cached_samples(self._settings, tic_id) if cached_features is not None else None
+
+        if samples is None:
             try:
-                lc_store.fetch_lightcurve_from_mast(self._settings, tic_id)
-                auto_fetch = True
                 time_arr, flux_arr, flux_err_arr = lc_store.get_lightcurve_by_tic(self._settings, tic_id)
-            except Exception as fetch_exc:  # pragma: no cover - network heavy
-                LOGGER.warning('auto_fetch_failed', extra={'tic_id': tic_id, 'error': str(fetch_exc)})
-                raise LightcurveNotFoundError(str(fetch_exc)) from fetch_exc
-
-        cached_features = None if auto_fetch else lc_store.read_cached_features(self._settings, tic_id)
+            except FileNotFoundError as exc:
+                if not self._settings.auto_fetch_missing:
+                    raise LightcurveNotFoundError(str(exc)) from exc
+                try:
+                    lc_store.fetch_lightcurve_from_mast(self._settings, tic_id)
+                    auto_fetch = True
+                    cached_features = None
+                    time_arr, flux_arr, flux_err_arr = lc_store.get_lightcurve_by_tic(self._settings, tic_id)
+                except Exception as fetch_exc:  # pragma: no cover - network heavy
+                    LOGGER.warning('auto_fetch_failed', extra={'tic_id': tic_id, 'error': str(fetch_exc)})
+                    raise LightcurveNotFoundError(str(fetch_exc)) from fetch_exc
 
         if cached_features is not None:
-            features_series = cached_features.astype(float, copy=False)
-            summary = self._summary_from_features(features_series)
+            features = cached_features
+            summary = self._summary_from_features(features)
             warnings: List[str] = []
             cache_hit = True
         else:
             try:
-                bls_result = self._compute_features(
-                    time=time_arr.tolist(),
-                    flux=flux_arr.tolist(),
-                    flux_err=flux_err_arr.tolist() if flux_err_arr is not None else None,
-                )
+                bls_result = self._compute_features(time=time_arr, flux=flux_arr, flux_err=flux_err_arr)
             except InsufficientDataError:
                 raise
             except Exception as exc:  # pragma: no cover - defensive path
                 LOGGER.exception('Unexpected failure during TIC prediction', extra={'tic_id': tic_id})
                 raise FeatureExtractionError(str(exc)) from exc
 
-            features_series = bls_result.features
+            features = bls_result.features
             summary = bls_result.summary
             warnings = bls_result.warnings
-            lc_store.write_cached_features(self._settings, tic_id, features_series)
+            lc_store.write_cached_features(self._settings, tic_id, features)
 
-        lightcurve_payload = self._prepare_lightcurve(time_arr, flux_arr, flux_err_arr)
+        if samples is None:
+            samples = self._downsample_lightcurve(time_arr, flux_arr, flux_err_arr)
+            lc_store.write_cached_samples(self._settings, tic_id, samples)
+        lightcurve_payload = self._samples_payload(samples)
 
         response = self._score(
-            features_series,
+            features,
             summary,
             warnings,
             tic_id=tic_id,
@@ -137,13 +178,13 @@ class InferenceService:
         flux_err: Optional[List[float]] = None,
         meta: Optional[Dict[str, float]] = None,
     ) -> Dict[str, Any]:
-        state = self.refresh()
+        state = self._current_state()
         start_ms = monotonic_ms()
-        bls_result = self._compute_features(time=time, flux=flux, flux_err=flux_err, meta=meta)
-
         time_arr = np.asarray(time, dtype=float)
         flux_arr = np.asarray(flux, dtype=float)
         flux_err_arr = np.asarray(flux_err, dtype=float) if flux_err is not None else None
+        bls_result = self._compute_features(time=time_arr, flux=flux_arr, flux_err=flux_err_arr, meta=meta)
+
         lightcurve_payload = self._prepare_lightcurve(time_arr, flux_arr, flux_err_arr)
 
         return self._score(
@@ -158,11 +199,62 @@ class InferenceService:
             lightcurve=lightcurve_payload,
         )
 
+    def predict_batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Predict several lightcurves, scoring all successful ones in a single model call.
+
+        Each item holds ``time``, ``flux`` and optional ``flux_err``/``meta``. Results keep
+        the input order and carry either a ``prediction`` or an ``error``.
+        """
+        state = self._current_state()
+        start_ms = monotonic_ms()
+
+        def extract(item: Dict[str, Any]) -> Tuple[Dict[str, np.ndarray], BLSResult]:
+            time_arr = np.asarray(item['time'], dtype=float)
+            flux_arr = np.asarray(item['flux'], dtype=float)
+            flux_err = item.get('flux_err')
+            flux_err_arr = np.asarray(flux_err, dtype=float) if flux_err is not None else None
+            bls_result = self._compute_features(time=time_arr, flux=flux_arr, flux_err=flux_err_arr, meta=item.get('meta'))
+            return self._downsample_lightcurve(time_arr, flux_arr, flux_err_arr), bls_result
+
+        # Up to BATCH_FEATURE_WORKERS curves are extracted at a time, each BLS launch on its
+        # worker's share of the cores (serialised if numba fell back to workqueue).
+        futures = [_BATCH_EXECUTOR.submit(extract, item) for item in items]
+        results: List[Dict[str, Any]] = [{'index': idx, 'prediction': None, 'error': None} for idx in range(len(items))]
+        scored: List[Tuple[int, Dict[str, np.ndarray], BLSResult]] = []
+        for idx, future in enumerate(futures):
+            try:
+                samples, bls_result = future.result()
+            except InsufficientDataError:
+                results[idx]['error'] = 'insufficient_data'
+            except FeatureExtractionError as exc:
+                results[idx]['error'] = str(exc)
+            else:
+                scored.append((idx, samples, bls_result))
+
+        if scored:
+            X = self._feature_matrix([bls_result.features for _, _, bls_result in scored], state)
+            scores, is_probability = self._model_scores(X, state)
+            for (idx, samples, bls_result), score in zip(scored, scores.tolist()):
+                results[idx]['prediction'] = self._build_response(
+                    bls_result.features,
+                    bls_result.summary,
+                    bls_result.warnings,
+                    score=score,
+                    is_probability=is_probability,
+                    tic_id=None,
+                    start_ms=start_ms,
+                    state=state,
+                    cache_hit=False,
+                    auto_fetch=False,
+                    lightcurve=self._samples_payload(samples),
+                )
+        return results
+
     def _compute_features(
         self,
-        time: List[float],
-        flux: List[float],
-        flux_err: Optional[List[float]] = None,
+        time: np.ndarray,
+        flux: np.ndarray,
+        flux_err: Optional[np.ndarray] = None,
         meta: Optional[Dict[str, float]] = None,
     ) -> BLSResult:
         try:
@@ -170,12 +262,75 @@ class InferenceService:
         except InsufficientDataError:
             raise
         except Exception as exc:  # pragma: no cover - logging path
-            LOGGER.exception('Failed to compute BLS features', extra={'size': len(time)})
+            LOGGER.exception('Failed to compute BLS features', extra={'size': time.size})
             raise FeatureExtractionError(str(exc)) from exc
 
+    def _feature_matrix(self, rows: List[Dict[str, float]], state: Dict[str, Any]) -> np.ndarray:
+        # Gather straight into the model rows; names the model does not know are
+        # dropped and features we did not compute stay NaN, as with reindex.
+        # Tree models cast their input to float32 internally, so rows are built
+        # in float32 unless a fitted (float64) scaler consumes them first.
+        row_dtype = np.float64 if state['scaler'] is not None else np.float32
+        X = np.full((len(rows), len(state['feature_names'])), np.nan, dtype=row_dtype)
+        for row_idx, features in enumerate(rows):
+            src, dst = self._feature_perm(tuple(features), state)
+            values = np.fromiter(features.values(), dtype=np.float64, count=len(features))
+            X[row_idx, dst] = values.take(src)
+        return X
+
+    @staticmethod
+    def _feature_perm(keys: Tuple[str, ...], state: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (source positions, model columns) for a feature dict with this key order."""
+        # build_bls_features and the feature cache emit a handful of stable key orders,
+        # so each order is resolved against the model columns once per loaded state.
+        perms = state['feature_perm']
+        perm = perms.get(keys)
+        if perm is None:
+            feature_index = state['feature_index']
+            pairs = [(pos, feature_index[name]) for pos, name in enumerate(keys) if name in feature_index]
+            src = np.fromiter((pos for pos, _ in pairs), dtype=np.intp, count=len(pairs))
+            dst = np.fromiter((col for _, col in pairs), dtype=np.intp, count=len(pairs))
+            perm = perms.setdefault(keys, (src, dst))
+        return perm
+
+    @staticmethod
+    def _model_scores(X: np.ndarray, state: Dict[str, Any]) -> Tuple[np.ndarray, bool]:
+        """Score every row of ``X``; returns clipped scores and whether they are probabilities."""
+        scaler = state['scaler']
+        fast_scale = state['scaler_transform']
+        if scaler is None:
+            X_model = X
+        elif fast_scale is not None and not np.isinf(X).any():
+            X_model = fast_scale(X)
+        else:
+            # sklearn's validation rejects infinities; keep that error path.
+            X_model = scaler.transform(X)
+
+        if state['mode'] == 'one_class':
+            model = state['model']
+            raw_scores = np.asarray(model.decision_function(X_model), dtype=np.float64)
+            return np.clip(raw_scores + 0.5, 0.0, 1.0), False
+
+        xgb_module = state['xgb']
+        model = state['model']
+        if xgb_module is None:
+            raise RuntimeError('XGBoost module not loaded for supervised mode')
+        calibrator = state['calibrator']
+        if calibrator is not None:
+            # The calibrator runs the booster itself, so a raw predict here would be discarded.
+            base_scores = calibrator.predict_proba(X_model)[:, 1]
+        else:
+            # inplace_predict skips DMatrix construction, which dominates single-row latency.
+            try:
+                base_scores = model.inplace_predict(X_model)
+            except Exception:  # pragma: no cover - older xgboost / unsupported input
+                dmatrix = xgb_module.DMatrix(X_model, feature_names=state['feature_names'])
+                base_scores = model.predict(dmatrix)
+        return np.clip(np.asarray(base_scores, dtype=np.float64), 0.0, 1.0), True
+
     def _score(
         self,
-        features: pd.Series,
+        features: Dict[str, float],
         summary: Dict[str, float],
         warnings: List[str],
         *,
@@ -184,40 +339,40 @@ class InferenceService:
         state: Dict[str, Any],
         cache_hit: Optional[bool],
         auto_fetch: bool,
-        lightcurve: Optional[Dict[str, List[float]]],
+        lightcurve: Optional[Dict[str, Optional[np.ndarray]]],
     ) -> Dict[str, Any]:
-        aligned = features.reindex(state['feature_names'])
-        aligned = aligned.astype(float)
-        matrix = aligned.to_frame().T
-        X = matrix.to_numpy(dtype=np.float64)
-
-        scaler = state['scaler']
-        if scaler is not None:
-            X_model = scaler.transform(X)
-        else:
-            X_model = X
-
-        if state['mode'] == 'one_class':
-            model = state['model']
-            raw_score = float(model.decision_function(X_model)[0])
-            score = float(np.clip(raw_score + 0.5, 0.0, 1.0))
-            is_probability = False
-        else:
-            xgb_module = state['xgb']
-            model = state['model']
-            if xgb_module is None:
-                raise RuntimeError('XGBoost module not loaded for supervised mode')
-            dmatrix = xgb_module.DMatrix(X_model, feature_names=state['feature_names'])
-            raw_output = model.predict(dmatrix)
-            base_score = float(raw_output[0])
-            calibrator = state['calibrator']
-            if calibrator is not None:
-                base_score = float(calibrator.predict_proba(X_model)[0, 1])
-            score = float(np.clip(base_score, 0.0, 1.0))
-            is_probability = True
+        scores, is_probability = self._model_scores(self._feature_matrix([features], state), state)
+        return self._build_response(
+            features,
+            summary,
+            warnings,
+            score=float(scores[0]),
+            is_probability=is_probability,
+            tic_id=tic_id,
+            start_ms=start_ms,
+            state=state,
+            cache_hit=cache_hit,
+            auto_fetch=auto_fetch,
+            lightcurve=lightcurve,
+        )
 
+    def _build_response(
+        self,
+        features: Dict[str, float],
+        summary: Dict[str, float],
+        warnings: List[str],
+        *,
+        score: float,
+        is_probability: bool,
+        tic_id: Optional[int],
+        start_ms: int,
+        state: Dict[str, Any],
+        cache_hit: Optional[bool],
+        auto_fetch: bool,
+        lightcurve: Optional[Dict[str, Optional[np.ndarray]]],
+    ) -> Dict[str, Any]:
         runtime = elapsed_ms(start_ms)
-        features_payload = self._serialize_series(features)
+        features_payload = self._serialize_features(features)
         summary_payload = self._serialize_summary(summary)
 
         response: Dict[str, Any] = {
@@ -254,56 +409,73 @@ class InferenceService:
         return response
 
     @staticmethod
-    def _serialize_series(series: pd.Series) -> Dict[str, Optional[float]]:
-        payload: Dict[str, Optional[float]] = {}
-        for key, value in series.items():
-            if pd.isna(value):
-                payload[str(key)] = None
-            else:
-                payload[str(key)] = float(value)
-        return payload
+    def _finite_or_none(keys: Iterable[Any], values: np.ndarray) -> Dict[str, Optional[float]]:
+        finite = np.isfinite(values)
+        return {
+            str(key): value if ok else None
+            for key, value, ok in zip(keys, values.tolist(), finite.tolist())
+        }
+
+    @staticmethod
+    def _serialize_features(features: Dict[str, float]) -> Dict[str, Optional[float]]:
+        values = np.fromiter(features.values(), dtype=np.float64, count=len(features))
+        return InferenceService._finite_or_none(features.keys(), values)
 
     @staticmethod
     def _serialize_summary(summary: Dict[str, float]) -> Dict[str, Optional[float]]:
-        payload: Dict[str, Optional[float]] = {}
-        for key, value in summary.items():
-            if value is None or (isinstance(value, float) and (math.isnan(value) or math.isinf(value))):
-                payload[str(key)] = None
-            else:
-                payload[str(key)] = float(value)
-        return payload
+        # ``None`` entries become NaN here and are mapped back to ``None``.
+        values = np.array(list(summary.values()), dtype=np.float64)
+        return InferenceService._finite_or_none(summary.keys(), values)
 
     @staticmethod
-    def _prepare_lightcurve(
+    def _downsample_lightcurve(
         time: np.ndarray | None,
         flux: np.ndarray | None,
         flux_err: np.ndarray | None,
         *,
         max_points: int = 5000,
-    ) -> Dict[str, List[float]]:
+    ) -> Dict[str, np.ndarray]:
         if time is None or flux is None or time.size == 0 or flux.size == 0:
-            return {'time': [], 'flux': []}
+            return {}
 
-        indices = slice(None)
-        if time.size > max_points:
-            indices = np.linspace(0, time.size - 1, num=max_points, dtype=int)
+        has_err = flux_err is not None and flux_err.size > 0
+        if time.size <= max_points:
+            samples = {'time': time, 'flux': flux}
+            if has_err:
+                samples['flux_err'] = flux_err
+            return samples
 
-        time_sampled = np.asarray(time)[indices]
-        flux_sampled = np.asarray(flux)[indices]
+        indices = np.linspace(0, time.size - 1, num=max_points).astype(np.intp, copy=False)
+        samples = {'time': time.take(indices), 'flux': flux.take(indices)}
+        if has_err:
+            samples['flux_err'] = flux_err.take(indices)
+        return samples
 
-        payload: Dict[str, List[float]] = {
-            'time': [float(v) for v in time_sampled],
-            'flux': [float(v) for v in flux_sampled],
+    @staticmethod
+    def _samples_payload(samples: Dict[str, np.ndarray]) -> Dict[str, Optional[np.ndarray]]:
+        if not samples:
+            return {'time': [], 'flux': [], 'flux_err': None}
+        # Arrays stay unboxed: the routes serialise them with orjson's native numpy
+        # support, which needs C-contiguous float64 buffers.
+        payload: Dict[str, Optional[np.ndarray]] = {
+            name: np.ascontiguousarray(values, dtype=np.float64) for name, values in samples.items()
         }
-
-        if flux_err is not None and flux_err.size:
-            flux_err_sampled = np.asarray(flux_err)[indices]
-            payload['flux_err'] = [float(v) for v in flux_err_sampled]
-
+        payload.setdefault('flux_err', None)
         return payload
 
     @staticmethod
-    def _summary_from_features(features: pd.Series) -> Dict[str, float]:
+    def _prepare_lightcurve(
+        time: np.ndarray | None,
+        flux: np.ndarray | None,
+        flux_err: np.ndarray | None,
+        *,
+        max_points: int = 5000,
+    ) -> Dict[str, Optional[np.ndarray]]:
+        samples = InferenceService._downsample_lightcurve(time, flux, flux_err, max_points=max_points)
+        return InferenceService._samples_payload(samples)
+
+    @staticmethod
+    def _summary_from_features(features: Dict[str, float]) -> Dict[str, float]:
         return {
             'period_days': float(features.get('period_days', np.nan)),
             'duration_hours': float(features.get('duration_hours', np.nan)),
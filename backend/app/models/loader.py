@@ -9,6 +9,7 @@ from typing import Any, Dict, Literal
 import joblib
 
 from app.config import Settings
+from app.models.scaling import fast_transform
 
 
 Mode = Literal['one_class', 'supervised']
@@ -92,11 +93,20 @@ def load_state(settings: Settings) -> Dict[str, Any]:
     if not feature_names:
         raise ValueError('Loaded feature names list is empty')
 
+    if mode == 'supervised':
+        # Attach names once so per-row scoring can pass bare ndarrays to inplace_predict.
+        if not model.feature_names:
+            model.feature_names = feature_names
+
     state = {
         'mode': mode,
         'feature_names': feature_names,
+        'feature_index': {name: idx for idx, name in enumerate(feature_names)},
+        # Key order -> (source positions, model columns), filled lazily by the service.
+        'feature_perm': {},
         'model': model,
         'scaler': scaler,
+        'scaler_transform': fast_transform(scaler),
         'calibrator': calibrator,
         'xgb': xgb_module if latest.startswith('model_xgb_') else None,
         'latest': latest,
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Optional
+
+import numpy as np
+from scipy.special import ndtri
+from sklearn.preprocessing import QuantileTransformer, StandardScaler
+
+# Mirrors sklearn.preprocessing._data.BOUNDS_THRESHOLD.
+BOUNDS_THRESHOLD = 1e-7
+
+Transform = Callable[[np.ndarray], np.ndarray]
+
+
+class _StandardTransform:
+    """``StandardScaler.transform`` on the fitted arrays, without input validation."""
+
+    def __init__(self, scaler: Any) -> None:
+        self._mean = None if scaler.mean_ is None or not scaler.with_mean else np.asarray(scaler.mean_, dtype=np.float64)
+        self._scale = None if scaler.scale_ is None or not scaler.with_std else np.asarray(scaler.scale_, dtype=np.float64)
+
+    def __call__(self, X: np.ndarray) -> np.ndarray:
+        out = np.array(X, dtype=np.float64)
+        if self._mean is not None:
+            out -= self._mean
+        if self._scale is not None:
+            out /= self._scale
+        return out
+
+
+class _QuantileTransform:
+    """Forward ``QuantileTransformer.transform`` with per-column tables prepared once."""
+
+    def __init__(self, scaler: Any) -> None:
+        quantiles = np.asarray(scaler.quantiles_, dtype=np.float64)
+        references = np.asarray(scaler.references_, dtype=np.float64)
+        self._columns = [
+            (np.ascontiguousarray(quantiles[:, j]), np.ascontiguousarray(-quantiles[::-1, j]))
+            for j in range(quantiles.shape[1])
+        ]
+        self._references = references
+        self._neg_references_rev = -references[::-1]
+        self._normal = scaler.output_distribution == 'normal'
+        # Same clip sklearn applies so the normal output never reaches +/-inf.
+        self._clip_min = ndtri(BOUNDS_THRESHOLD - np.spacing(1))
+        self._clip_max = ndtri(1 - (BOUNDS_THRESHOLD - np.spacing(1)))
+
+    def __call__(self, X: np.ndarray) -> np.ndarray:
+        out = np.array(X, dtype=np.float64)
+        for j, (quantiles, neg_quantiles_rev) in enumerate(self._columns):
+            col = out[:, j]
+            if self._normal:
+                lower_idx = col - BOUNDS_THRESHOLD < quantiles[0]
+                upper_idx = col + BOUNDS_THRESHOLD > quantiles[-1]
+            else:
+                lower_idx = col == quantiles[0]
+                upper_idx = col == quantiles[-1]
+            finite = ~np.isnan(col)
+            values = col[finite]
+            # Average both interpolation directions so repeated quantiles map to their midpoint.
+            col[finite] = 0.5 * (
+                np.interp(values, quantiles, self._references)
+                - np.interp(-values, neg_quantiles_rev, self._neg_references_rev)
+            )
+            col[upper_idx] = 1.0
+            col[lower_idx] = 0.0
+            if self._normal:
+                out[:, j] = np.clip(ndtri(col), self._clip_min, self._clip_max)
+        return out
+
+
+def fast_transform(scaler: Any) -> Optional[Transform]:
+    """Return a validation-free equivalent of ``scaler.transform`` for finite float rows.
+
+    Only fitted StandardScaler and QuantileTransformer instances are supported; other
+    scalers return None and keep using their own ``transform``.
+    """
+    if isinstance(scaler, StandardScaler):
+        return _StandardTransform(scaler)
+    if isinstance(scaler, QuantileTransformer):
+        return _QuantileTransform(scaler)
+    return None
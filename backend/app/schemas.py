@@ -54,6 +54,8 @@ class PredictionMeta(BaseModel):
     artifact_dir: str
     feature_names_version: str
     runtime_ms: int
+    cache_hit: Optional[bool] = None
+    auto_fetch: bool = False
 
 
 class LightcurveSeries(BaseModel):
@@ -84,3 +86,22 @@ class PredictionResponse(BaseModel):
     lightcurve: Optional[LightcurveSeries] = None
 
     model_config = ConfigDict(extra='forbid')
+
+
+MAX_BATCH_SIZE = 64
+
+
+class LightcurveBatchPayload(BaseModel):
+    items: List[LightcurvePayload] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+    model_config = ConfigDict(extra='forbid')
+
+
+class BatchPredictionItem(BaseModel):
+    index: NonNegativeInt
+    prediction: Optional[PredictionResponse] = None
+    error: Optional[str] = None
+
+
+class BatchPredictionResponse(BaseModel):
+    results: List[BatchPredictionItem]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Callable, Iterator
+
+import joblib
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sklearn.ensemble import IsolationForest
+
+from app.config import Settings
+from app.deps import close_inference_service, get_inference_service
+from app.main import APP
+from app.models.infer import InferenceService
+
+
+# Keys produced by build_bls_features, in the order the one-class fixture model expects.
+BLS_FEATURES = [
+    'period_days', 'duration_hours', 'depth_ppm', 'snr', 't0_btjd', 'duty_cycle', 'n_transits',
+    'odd_even_depth_ratio', 'secondary_snr', 'in_vs_out_rms', 'rms_before', 'rms_after', 'data_fraction_kept',
+]
+
+
+@pytest.fixture(autouse=True, scope='session')
+def _stop_model_watcher() -> Iterator[None]:
+    # Module-level TestClients skip the lifespan, so stop any shared service here.
+    yield
+    close_inference_service()
+
+
+@pytest.fixture
+def write_artifacts() -> Callable[[Path, str], str]:
+    """Write a tiny one-class artifact set (model + feature names) and return the model file name."""
+
+    def _write(model_dir: Path, version: str) -> str:
+        rng = np.random.default_rng(0)
+        model = IsolationForest(n_estimators=5, random_state=0).fit(rng.normal(size=(32, len(BLS_FEATURES))))
+        name = f'model_iso_{version}.pkl'
+        joblib.dump(model, model_dir / name)
+        (model_dir / f'feature_names_{version}.json').write_text(json.dumps(BLS_FEATURES), encoding='utf-8')
+        return name
+
+    return _write
+
+
+@pytest.fixture
+def api_client(tmp_path: Path, write_artifacts: Callable[[Path, str], str]) -> Iterator[TestClient]:
+    """TestClient whose routes score with a fixture artifact and a short BLS period grid."""
+    (tmp_path / 'latest.txt').write_text(write_artifacts(tmp_path, 'test'), encoding='utf-8')
+    settings = Settings(
+        model_dir=tmp_path,
+        processed_dir=tmp_path / 'processed',
+        interim_dir=tmp_path / 'interim',
+        n_periods=500,
+    )
+    service = InferenceService(settings)
+    APP.dependency_overrides[get_inference_service] = lambda: service
+    try:
+        yield TestClient(APP)
+    finally:
+        APP.dependency_overrides.pop(get_inference_service, None)
+        service.close()
+
+
+def synthetic_lightcurve(n: int = 1500, seed: int = 0) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    time = np.linspace(1500.0, 1527.0, n)
+    flux = 1.0 + rng.normal(0.0, 1e-3, n)
+    flux[((time - 1501.0) % 3.3) < 0.1] -= 4e-3
+    flux_err = np.full(n, 1e-3)
+    return {'time': time, 'flux': flux, 'flux_err': flux_err}
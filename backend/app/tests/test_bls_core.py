@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from astropy.timeseries import BoxLeastSquares
+
+from app.features import _bls_core
+from app.features._bls_core import DEFAULT_OVERSAMPLE, bls_power
+
+
+requires_numba = pytest.mark.skipif(_bls_core._bls_power_jit is None, reason='numba not installed')
+
+FIELDS = ('power', 'depth', 'duration', 'transit_time')
+
+
+def _lightcurve(n: int, seed: int, with_dy: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray | None]:
+    rng = np.random.default_rng(seed)
+    # BTJD-like offsets and a flux level near 1 exercise the t_ref shift and median subtraction.
+    time = np.sort(rng.uniform(1500.0, 1527.0, n))
+    flux = 1.0 + rng.normal(0.0, 1e-3, n)
+    flux[((time - 1501.3) % 3.7) < 0.12] -= 3e-3
+    dy = rng.uniform(0.8e-3, 1.2e-3, n) if with_dy else None
+    return time, flux, dy
+
+
+def _assert_matches_astropy(time, flux, dy, periods, durations) -> None:
+    expected = BoxLeastSquares(time, flux, dy=dy).power(periods, durations, oversample=DEFAULT_OVERSAMPLE)
+    result = bls_power(time, flux, dy, periods, durations)
+    for field in FIELDS:
+        np.testing.assert_array_equal(getattr(result, field), np.asarray(getattr(expected, field)), err_msg=field)
+
+
+@requires_numba
+@pytest.mark.parametrize('with_dy', [False, True])
+def test_bls_power_kernel_matches_astropy(with_dy: bool) -> None:
+    time, flux, dy = _lightcurve(3000, seed=3, with_dy=with_dy)
+    periods = np.linspace(0.5, 10.0, 400)
+    durations = np.linspace(0.5 / 24.0, 6.0 / 24.0, 8)
+    _assert_matches_astropy(time, flux, dy, periods, durations)
+
+
+@pytest.mark.parametrize('with_dy', [False, True])
+def test_bls_power_python_loop_matches_astropy(monkeypatch: pytest.MonkeyPatch, with_dy: bool) -> None:
+    # The uncompiled loop is the kernel's source; checking it keeps the port honest without numba.
+    monkeypatch.setattr(_bls_core, '_bls_power_jit', _bls_core._bls_power_loop)
+    time, flux, dy = _lightcurve(300, seed=5, with_dy=with_dy)
+    _assert_matches_astropy(time, flux, dy, np.linspace(0.5, 10.0, 25), np.linspace(0.5 / 24.0, 6.0 / 24.0, 3))
+
+
+def test_bls_power_without_numba_uses_astropy(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_bls_core, '_bls_power_jit', None)
+    time, flux, dy = _lightcurve(500, seed=11, with_dy=True)
+    _assert_matches_astropy(time, flux, dy, np.linspace(0.5, 10.0, 50), np.linspace(0.5 / 24.0, 6.0 / 24.0, 4))
+
+
+@requires_numba
+def test_bls_power_rejects_durations_longer_than_periods() -> None:
+    time, flux, _ = _lightcurve(200, seed=1, with_dy=False)
+    with pytest.raises(ValueError):
+        bls_power(time, flux, None, np.array([0.2, 0.3]), np.array([0.25]))
+
+
+@requires_numba
+def test_bls_power_concurrent_calls_match_serial() -> None:
+    curves = [_lightcurve(1500, seed=seed, with_dy=False) for seed in range(4)]
+    periods = np.linspace(0.5, 10.0, 200)
+    durations = np.linspace(0.5 / 24.0, 6.0 / 24.0, 5)
+
+    serial = [bls_power(time, flux, dy, periods, durations) for time, flux, dy in curves]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        concurrent = list(pool.map(lambda curve: bls_power(*curve, periods, durations), curves))
+
+    for expected, result in zip(serial, concurrent):
+        for field in FIELDS:
+            np.testing.assert_array_equal(getattr(result, field), getattr(expected, field))
+
+
+@requires_numba
+def test_bls_power_serialises_only_on_workqueue() -> None:
+    time, flux, dy = _lightcurve(200, seed=2, with_dy=False)
+    bls_power(time, flux, dy, np.linspace(0.5, 5.0, 10), np.array([0.05]))
+
+    layer = _bls_core.numba.threading_layer()
+    assert _bls_core._serialise_launches is (layer == 'workqueue')
+
+
+@requires_numba
+def test_limit_kernel_threads_is_per_thread() -> None:
+    total = _bls_core.numba.get_num_threads()
+    with ThreadPoolExecutor(max_workers=1, initializer=_bls_core.limit_kernel_threads, initargs=(1,)) as pool:
+        assert pool.submit(_bls_core.numba.get_num_threads).result() == 1
+        time, flux, dy = _lightcurve(300, seed=4, with_dy=False)
+        periods, durations = np.linspace(0.5, 5.0, 20), np.array([0.05])
+        capped = pool.submit(bls_power, time, flux, dy, periods, durations).result()
+    assert _bls_core.numba.get_num_threads() == total
+
+    expected = bls_power(time, flux, dy, periods, durations)
+    for field in FIELDS:
+        np.testing.assert_array_equal(getattr(capped, field), getattr(expected, field))
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.features import _bls_kernels
+from app.features._bls_kernels import (
+    AFTER_T0,
+    BEFORE_T0,
+    EVEN,
+    IN_TRANSIT,
+    N_GROUPS,
+    ODD,
+    OUT_OF_TRANSIT,
+    _post_bls_stats_numpy,
+)
+
+
+requires_numba = pytest.mark.skipif(_bls_kernels._post_bls_stats_jit is None, reason='numba not installed')
+
+
+def _lightcurve(n: int = 2000, seed: int = 7) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    time = np.sort(rng.uniform(1500.0, 1527.0, n))
+    flux = rng.normal(0.0, 1e-3, n)
+    return time, flux
+
+
+def _transit_mask(time: np.ndarray, t0: float, period: float, duration: float) -> np.ndarray:
+    phase = np.abs((time - t0 + 0.5 * period) % period - 0.5 * period)
+    return phase < 0.5 * duration
+
+
+CASES = {
+    'transits': (1503.2, 3.1, lambda time, t0, period: _transit_mask(time, t0, period, 0.15)),
+    'no_in_transit': (1503.2, 3.1, lambda time, t0, period: np.zeros(time.size, dtype=bool)),
+    'all_in_transit': (1503.2, 3.1, lambda time, t0, period: np.ones(time.size, dtype=bool)),
+    'zero_period': (1503.2, 0.0, lambda time, t0, period: _transit_mask(time, t0, 3.1, 0.15)),
+    't0_after_all': (1600.0, 3.1, lambda time, t0, period: _transit_mask(time, t0, period, 0.15)),
+    't0_before_all': (1400.0, 3.1, lambda time, t0, period: _transit_mask(time, t0, period, 0.15)),
+}
+
+
+@requires_numba
+@pytest.mark.parametrize('case', sorted(CASES))
+def test_post_bls_stats_kernel_matches_numpy(case: str) -> None:
+    time, flux = _lightcurve()
+    t0, period, make_mask = CASES[case]
+    mask = make_mask(time, t0, period)
+
+    counts, means, stds = _bls_kernels.post_bls_stats(time, flux, mask, t0, period)
+    ref_counts, ref_means, ref_stds = _post_bls_stats_numpy(time, flux, mask, t0, period)
+
+    assert counts.shape == means.shape == stds.shape == (N_GROUPS,)
+    np.testing.assert_array_equal(counts, ref_counts)
+    # The kernel is compiled with fastmath, so sums may be reassociated.
+    np.testing.assert_allclose(means, ref_means, rtol=1e-9, atol=1e-15)
+    np.testing.assert_allclose(stds, ref_stds, rtol=1e-9, atol=1e-15)
+
+
+@requires_numba
+def test_post_bls_stats_empty_groups_are_zero() -> None:
+    time, flux = _lightcurve()
+    mask = np.zeros(time.size, dtype=bool)
+    t0 = float(time[0]) - 1.0
+
+    for stats in (
+        _bls_kernels.post_bls_stats(time, flux, mask, t0, 3.1),
+        _post_bls_stats_numpy(time, flux, mask, t0, 3.1),
+    ):
+        counts, means, stds = stats
+        for group in (IN_TRANSIT, ODD, EVEN, BEFORE_T0):
+            assert counts[group] == 0
+            assert means[group] == 0.0
+            assert stds[group] == 0.0
+        assert counts[OUT_OF_TRANSIT] == counts[AFTER_T0] == time.size
+
+
+@requires_numba
+def test_post_bls_stats_sample_at_t0_is_in_neither_side() -> None:
+    time, flux = _lightcurve(n=101)
+    t0 = float(time[50])
+    mask = _transit_mask(time, t0, 3.1, 0.15)
+
+    counts, _, _ = _bls_kernels.post_bls_stats(time, flux, mask, t0, 3.1)
+    ref_counts, _, _ = _post_bls_stats_numpy(time, flux, mask, t0, 3.1)
+
+    np.testing.assert_array_equal(counts, ref_counts)
+    assert counts[BEFORE_T0] == 50
+    assert counts[AFTER_T0] == 50
+
+
+def _masked_reference(time, flux, mask, t0, period) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # What the stats were before bincount: np.mean/np.std over masked copies.
+    parity = np.floor((time - t0) / period + 1e-6).astype(np.int64) % 2 if period > 0 else np.zeros(time.size, np.int64)
+    selections = {
+        IN_TRANSIT: mask,
+        OUT_OF_TRANSIT: ~mask,
+        ODD: mask & (parity == 0),
+        EVEN: mask & (parity == 1),
+        BEFORE_T0: time < t0,
+        AFTER_T0: time > t0,
+    }
+    counts = np.zeros(N_GROUPS, dtype=np.int64)
+    means = np.zeros(N_GROUPS)
+    stds = np.zeros(N_GROUPS)
+    for group, selected in selections.items():
+        values = flux[selected]
+        counts[group] = values.size
+        if values.size:
+            means[group] = np.mean(values)
+            stds[group] = np.std(values)
+    return counts, means, stds
+
+
+@pytest.mark.parametrize('case', sorted(CASES))
+def test_post_bls_stats_bincount_fallback(monkeypatch: pytest.MonkeyPatch, case: str) -> None:
+    # Exercise the no-numba runtime path even though numba is a backend requirement.
+    monkeypatch.setattr(_bls_kernels, '_post_bls_stats_jit', None)
+    time, flux = _lightcurve()
+    t0, period, make_mask = CASES[case]
+    mask = make_mask(time, t0, period)
+
+    counts, means, stds = _bls_kernels.post_bls_stats(time, flux, mask, t0, period)
+    ref_counts, ref_means, ref_stds = _masked_reference(time, flux, mask, t0, period)
+
+    np.testing.assert_array_equal(counts, ref_counts)
+    np.testing.assert_allclose(means, ref_means, rtol=1e-12, atol=1e-18)
+    np.testing.assert_allclose(stds, ref_stds, rtol=1e-12, atol=1e-18)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import pytest
+
+from app.config import Settings, _parse_warm_tics
+
+
+@pytest.mark.parametrize(
+    ('raw', 'expected'),
+    [
+        (None, ()),
+        ('', ()),
+        ('396740648', (396740648,)),
+        (' 11, 22 ,,33 ', (11, 22, 33)),
+        (['11', 22], (11, 22)),
+        ((5,), (5,)),
+    ],
+)
+def test_parse_warm_tics(raw: object, expected: tuple[int, ...]) -> None:
+    assert _parse_warm_tics(raw) == expected
+
+
+@pytest.mark.parametrize('raw', ['11,abc', 12.5])
+def test_parse_warm_tics_rejects_bad_values(raw: object) -> None:
+    with pytest.raises(ValueError):
+        _parse_warm_tics(raw)
+
+
+def test_settings_from_env_reads_warm_tics(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv('WARM_TICS', '1,2, 3')
+    assert Settings.from_env().warm_tics == (1, 2, 3)
+    monkeypatch.delenv('WARM_TICS')
+    assert Settings.from_env().warm_tics == ()
+
+
+@pytest.mark.parametrize(
+    'overrides',
+    [
+        {'period_min': 0.001},
+        {'period_max': 0.5},
+        {'n_periods': 99},
+        {'dur_min_hours': 0.05},
+        {'dur_max_hours': 0.4},
+    ],
+)
+def test_settings_bounds(overrides: dict) -> None:
+    with pytest.raises(ValueError):
+        Settings(**overrides)
+
+
+def test_settings_bounds_accept_limits() -> None:
+    Settings(period_min=0.01, period_max=0.51, n_periods=100, dur_min_hours=0.1, dur_max_hours=0.5)
+
+
+def test_settings_is_frozen() -> None:
+    with pytest.raises(AttributeError):
+        Settings().n_periods = 10  # type: ignore[misc]
@@ -1,5 +1,13 @@
+import asyncio
+from pathlib import Path
+from typing import Callable
+
+import pytest
 from fastapi.testclient import TestClient
 
+from app import deps, main
+from app.config import Settings
+from app.models import loader
 from app.main import APP
 
 
@@ -10,3 +18,35 @@ def test_health() -> None:
     response = client.get('/health')
     assert response.status_code == 200
     assert response.json() == {'ok': True}
+
+
+def test_lifespan_runs_startup_warmups(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, write_artifacts: Callable[[Path, str], str]
+) -> None:
+    (tmp_path / 'latest.txt').write_text(write_artifacts(tmp_path, 'test'), encoding='utf-8')
+    monkeypatch.setattr(deps, 'get_settings', lambda: Settings(model_dir=tmp_path))
+    deps.close_inference_service()
+
+    calls: list[str] = []
+    loads_on_loop: list[bool] = []
+    load_state = loader.load_state
+
+    def _load_state(app_settings: Settings) -> dict:
+        try:
+            asyncio.get_running_loop()
+            loads_on_loop.append(True)
+        except RuntimeError:
+            loads_on_loop.append(False)
+        return load_state(app_settings)
+
+    monkeypatch.setattr(loader, 'load_state', _load_state)
+    monkeypatch.setattr(main, '_warmup_bls', lambda app_settings: calls.append('bls'))
+    monkeypatch.setattr(main, '_warm_lightcurves', lambda app_settings: calls.append('lightcurves'))
+
+    with TestClient(main.APP) as lifespan_client:
+        assert sorted(calls) == ['bls', 'lightcurves']
+        # The model loads once, on a worker thread rather than the event loop's.
+        assert loads_on_loop == [False]
+        assert deps._service is not None
+        assert lifespan_client.get('/health').status_code == 200
+    assert deps._service is None
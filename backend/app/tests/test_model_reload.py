@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Callable
+
+from app.config import Settings
+from app.models.infer import InferenceService
+
+
+def _point_latest(model_dir: Path, name: str, bump_s: float = 0.0) -> None:
+    latest = model_dir / 'latest.txt'
+    latest.write_text(name, encoding='utf-8')
+    if bump_s:
+        stamp = latest.stat().st_mtime + bump_s
+        os.utime(latest, (stamp, stamp))
+
+
+def test_watcher_reloads_swapped_artifact_and_stops_on_close(
+    tmp_path: Path,
+    write_artifacts: Callable[[Path, str], str],
+) -> None:
+    _point_latest(tmp_path, write_artifacts(tmp_path, 'va'))
+    service = InferenceService(Settings(model_dir=tmp_path, interim_dir=tmp_path / 'interim'), poll_interval=0.02)
+    try:
+        assert service.version_info()['model'] == 'model_iso_va.pkl'
+
+        _point_latest(tmp_path, write_artifacts(tmp_path, 'vb'), bump_s=5.0)
+        deadline = time.monotonic() + 5.0
+        while service.version_info()['model'] != 'model_iso_vb.pkl' and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert service.version_info()['model'] == 'model_iso_vb.pkl'
+        assert service.model_info()['feature_names_version'] == 'vb'
+    finally:
+        service.close()
+    assert not service._watcher.is_alive()
+
+
+def test_watcher_keeps_serving_when_new_artifact_is_broken(
+    tmp_path: Path,
+    write_artifacts: Callable[[Path, str], str],
+) -> None:
+    _point_latest(tmp_path, write_artifacts(tmp_path, 'va'))
+    service = InferenceService(Settings(model_dir=tmp_path, interim_dir=tmp_path / 'interim'), poll_interval=0.02)
+    try:
+        _point_latest(tmp_path, 'model_iso_missing.pkl', bump_s=5.0)
+        time.sleep(0.2)
+        assert service.version_info()['model'] == 'model_iso_va.pkl'
+    finally:
+        service.close()
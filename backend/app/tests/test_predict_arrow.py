@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+from fastapi.testclient import TestClient
+
+from app.schemas import MAX_BATCH_SIZE
+from app.tests.conftest import synthetic_lightcurve
+
+
+ARROW_HEADERS = {'Content-Type': 'application/vnd.apache.arrow.stream'}
+
+
+def _frame(seed: int = 0, n: int = 1500, with_err: bool = True) -> pd.DataFrame:
+    frame = pd.DataFrame(synthetic_lightcurve(n=n, seed=seed))
+    return frame if with_err else frame.drop(columns='flux_err')
+
+
+def _arrow_payload(frames: list[pd.DataFrame]) -> bytes:
+    # One record batch per curve, sharing a schema; a curve without flux_err sends nulls.
+    columns = [name for name in ('time', 'flux', 'flux_err') if any(name in frame.columns for frame in frames)]
+    schema = pa.schema([(name, pa.float64()) for name in columns])
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for frame in frames:
+            arrays = [pa.array(frame[name]) if name in frame.columns else pa.nulls(len(frame), pa.float64()) for name in columns]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+    return sink.getvalue().to_pybytes()
+
+
+def _json_prediction(client: TestClient, frame: pd.DataFrame) -> dict:
+    body = {name: frame[name].tolist() for name in frame.columns}
+    return client.post('/predict/from_lightcurve', json=body).json()
+
+
+def test_from_arrow_round_trip_matches_json(api_client: TestClient) -> None:
+    frame = _frame()
+    response = api_client.post('/predict/from_arrow', content=_arrow_payload([frame]), headers=ARROW_HEADERS)
+
+    assert response.status_code == 200
+    expected = _json_prediction(api_client, frame)
+    assert response.json()['score'] == pytest.approx(expected['score'])
+    assert response.json()['features'] == expected['features']
+
+
+def test_from_lightcurves_round_trip_keeps_order(api_client: TestClient) -> None:
+    # The second curve has no flux_err and travels as a null column in the shared schema.
+    frames = [_frame(seed=0), _frame(seed=1, with_err=False), _frame(seed=2)]
+    response = api_client.post('/predict/from_lightcurves', content=_arrow_payload(frames), headers=ARROW_HEADERS)
+
+    assert response.status_code == 200
+    results = response.json()['results']
+    assert [result['index'] for result in results] == [0, 1, 2]
+    for frame, result in zip(frames, results):
+        assert result['error'] is None
+        assert result['prediction']['score'] == pytest.approx(_json_prediction(api_client, frame)['score'])
+
+
+@pytest.mark.parametrize('route', ['/predict/from_arrow', '/predict/from_lightcurves'])
+def test_arrow_routes_reject_single_sample(api_client: TestClient, route: str) -> None:
+    frames = [_frame(n=1)] if route == '/predict/from_arrow' else [_frame(), _frame(n=1)]
+    response = api_client.post(route, content=_arrow_payload(frames), headers=ARROW_HEADERS)
+
+    assert response.status_code == 422
+    assert 'at least two samples' in response.json()['detail']
+    if route == '/predict/from_lightcurves':
+        assert response.json()['detail'].startswith('batches[1]: ')
+
+
+@pytest.mark.parametrize('route', ['/predict/from_arrow', '/predict/from_lightcurves'])
+def test_arrow_routes_reject_bad_streams(api_client: TestClient, route: str) -> None:
+    assert api_client.post(route, content=b'not arrow', headers=ARROW_HEADERS).status_code == 400
+
+    no_flux = _arrow_payload([_frame().drop(columns='flux')])
+    response = api_client.post(route, content=no_flux, headers=ARROW_HEADERS)
+    assert response.status_code == 400
+    assert 'time and flux' in response.json()['detail']
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, pa.schema([('time', pa.float64()), ('flux', pa.float64())])):
+        pass
+    assert api_client.post(route, content=sink.getvalue().to_pybytes(), headers=ARROW_HEADERS).status_code == 400
+
+
+def test_from_lightcurves_rejects_oversized_stream(api_client: TestClient) -> None:
+    payload = _arrow_payload([_frame(n=10)] * (MAX_BATCH_SIZE + 1))
+    response = api_client.post('/predict/from_lightcurves', content=payload, headers=ARROW_HEADERS)
+    assert response.status_code == 400
+
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models.infer import FeatureExtractionError, InferenceService
+from app.schemas import MAX_BATCH_SIZE
+from app.tests.conftest import synthetic_lightcurve
+
+
+def _item(seed: int = 0, n: int = 1500) -> dict:
+    return {key: values.tolist() for key, values in synthetic_lightcurve(n=n, seed=seed).items()}
+
+
+def test_batch_scores_items_in_order(api_client: TestClient) -> None:
+    items = [_item(seed=0), _item(seed=1)]
+    response = api_client.post('/predict/batch', json={'items': items})
+    assert response.status_code == 200
+    results = response.json()['results']
+    assert [result['index'] for result in results] == [0, 1]
+
+    for item, result in zip(items, results):
+        assert result['error'] is None
+        single = api_client.post('/predict/from_lightcurve', json=item).json()
+        assert result['prediction']['score'] == pytest.approx(single['score'])
+        assert result['prediction']['features'] == single['features']
+
+
+def test_batch_reports_per_item_errors(api_client: TestClient) -> None:
+    # Two samples pass the schema but leave BLS nothing to fold.
+    short = {'time': [1.0, 2.0], 'flux': [1.0, 1.0]}
+    response = api_client.post('/predict/batch', json={'items': [short, _item()]})
+    assert response.status_code == 200
+    first, second = response.json()['results']
+    assert first['prediction'] is None
+    assert first['error'] == 'insufficient_data'
+    assert second['error'] is None
+    assert second['prediction'] is not None
+
+
+def test_batch_rejects_length_mismatch(api_client: TestClient) -> None:
+    bad = {'time': [1.0, 2.0, 3.0], 'flux': [1.0, 1.0]}
+    response = api_client.post('/predict/batch', json={'items': [bad]})
+    assert response.status_code == 400
+    assert 'items[0]' in response.json()['detail']
+
+
+def test_batch_enforces_size_limits(api_client: TestClient) -> None:
+    tiny = {'time': [1.0, 2.0], 'flux': [1.0, 1.0]}
+    assert api_client.post('/predict/batch', json={'items': []}).status_code == 422
+    too_many = api_client.post('/predict/batch', json={'items': [tiny] * (MAX_BATCH_SIZE + 1)})
+    assert too_many.status_code == 422
+
+
+def test_batch_maps_service_errors(api_client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    def _fail(self: InferenceService, items: list) -> list:
+        raise FeatureExtractionError('scoring failed')
+
+    monkeypatch.setattr(InferenceService, 'predict_batch', _fail)
+    response = api_client.post('/predict/batch', json={'items': [_item()]})
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'scoring failed'
+
+
+def test_batch_workers_share_the_cores() -> None:
+    numba = pytest.importorskip('numba')
+    from app.models.infer import _BATCH_EXECUTOR, BATCH_FEATURE_WORKERS
+
+    per_worker = _BATCH_EXECUTOR.submit(numba.get_num_threads).result()
+    assert per_worker == max(1, min((os.cpu_count() or 1) // BATCH_FEATURE_WORKERS, numba.config.NUMBA_NUM_THREADS))
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from app.models.infer import InferenceService
+from app.schemas import BatchPredictionResponse, PredictionResponse
+from app.tests.conftest import synthetic_lightcurve
+
+
+# The public prediction shape. Routes return raw responses, so response_model does not
+# check it; changing any of these keys is an API change and should fail here first.
+PREDICTION_KEYS = {'tic_id', 'mode', 'is_probability', 'score', 'summary', 'features', 'warnings', 'meta', 'lightcurve'}
+SUMMARY_KEYS = {'period_days', 'duration_hours', 'depth_ppm', 'snr', 't0_btjd'}
+META_KEYS = {'artifact_dir', 'feature_names_version', 'runtime_ms', 'cache_hit', 'auto_fetch'}
+LIGHTCURVE_KEYS = {'time', 'flux', 'flux_err'}
+
+
+def _assert_prediction_shape(payload: dict) -> PredictionResponse:
+    assert set(payload) == PREDICTION_KEYS
+    assert set(payload['summary']) == SUMMARY_KEYS
+    assert set(payload['meta']) == META_KEYS
+    assert set(payload['lightcurve']) == LIGHTCURVE_KEYS
+    return PredictionResponse.model_validate(payload)
+
+
+def test_from_lightcurve_response_shape(api_client: TestClient) -> None:
+    curve = synthetic_lightcurve()
+    body = {'time': curve['time'].tolist(), 'flux': curve['flux'].tolist()}
+    payload = api_client.post('/predict/from_lightcurve', json=body).json()
+
+    prediction = _assert_prediction_shape(payload)
+    assert prediction.tic_id is None
+    assert prediction.meta.cache_hit is False
+    assert prediction.meta.auto_fetch is False
+    # Without flux_err the key is still present, as null.
+    assert payload['lightcurve']['flux_err'] is None
+
+
+def test_by_tic_response_shape_and_cache_flag(api_client: TestClient, tmp_path: Path) -> None:
+    lightcurves = tmp_path / 'processed' / 'lightcurves'
+    lightcurves.mkdir(parents=True)
+    pd.DataFrame(synthetic_lightcurve()).to_parquet(lightcurves / 'TIC-42.parquet', index=False)
+
+    first = _assert_prediction_shape(api_client.get('/predict/by_tic', params={'tic_id': 42}).json())
+    second = _assert_prediction_shape(api_client.get('/predict/by_tic', params={'tic_id': 42}).json())
+
+    assert first.tic_id == second.tic_id == 42
+    assert first.meta.cache_hit is False
+    assert second.meta.cache_hit is True
+    assert second.score == first.score
+    assert second.lightcurve is not None and second.lightcurve.flux_err is not None
+
+
+def test_batch_response_shape(api_client: TestClient) -> None:
+    curve = synthetic_lightcurve()
+    body = {'items': [{'time': curve['time'].tolist(), 'flux': curve['flux'].tolist()}]}
+    payload = api_client.post('/predict/batch', json=body).json()
+
+    BatchPredictionResponse.model_validate(payload)
+    (result,) = payload['results']
+    assert set(result) == {'index', 'prediction', 'error'}
+    _assert_prediction_shape(result['prediction'])
+
+
+def test_long_lightcurves_keep_truncated_linspace_samples() -> None:
+    time = np.arange(12_345, dtype=np.float64)
+    samples = InferenceService._downsample_lightcurve(time, time * 2.0, None, max_points=5000)
+
+    expected = np.linspace(0, time.size - 1, num=5000, dtype=int)
+    np.testing.assert_array_equal(samples['time'], time[expected])
+    np.testing.assert_array_equal(samples['flux'], 2.0 * time[expected])
+    assert 'flux_err' not in samples
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from sklearn.preprocessing import MinMaxScaler, QuantileTransformer, StandardScaler
+
+from app.models.scaling import BOUNDS_THRESHOLD, fast_transform
+
+
+def _training_data(seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.normal(5.0, 2.0, 400),
+        rng.lognormal(0.0, 1.0, 400),
+        rng.integers(0, 4, 400).astype(float),  # repeated quantiles
+        np.full(400, 3.0),  # constant column
+    ])
+    X[rng.choice(400, 20, replace=False), 1] = np.nan
+    return X
+
+
+def _probe_rows(X: np.ndarray) -> np.ndarray:
+    lo = np.nanmin(X, axis=0)
+    hi = np.nanmax(X, axis=0)
+    rows = [
+        np.nanmedian(X, axis=0),
+        lo,  # exactly the first quantile
+        hi,  # exactly the last quantile
+        lo + 0.5 * BOUNDS_THRESHOLD,  # inside the normal-output lower bound band
+        hi - 0.5 * BOUNDS_THRESHOLD,
+        lo - 10.0,  # out of range
+        hi + 10.0,
+        np.full(X.shape[1], np.nan),
+        np.where(np.arange(X.shape[1]) % 2 == 0, np.nan, hi),
+    ]
+    return np.vstack(rows + list(X[:25]))
+
+
+@pytest.mark.parametrize('output_distribution', ['uniform', 'normal'])
+def test_quantile_transform_matches_sklearn(output_distribution: str) -> None:
+    X = _training_data()
+    scaler = QuantileTransformer(n_quantiles=50, output_distribution=output_distribution, random_state=0).fit(X)
+    probe = _probe_rows(X)
+    np.testing.assert_array_equal(fast_transform(scaler)(probe), scaler.transform(probe))
+
+
+@pytest.mark.parametrize(('with_mean', 'with_std'), [(True, True), (False, True), (True, False)])
+def test_standard_transform_matches_sklearn(with_mean: bool, with_std: bool) -> None:
+    X = _training_data()
+    scaler = StandardScaler(with_mean=with_mean, with_std=with_std).fit(X)
+    probe = _probe_rows(X)
+    np.testing.assert_array_equal(fast_transform(scaler)(probe), scaler.transform(probe))
+
+
+def test_fast_transform_accepts_float32_rows() -> None:
+    X = _training_data()
+    scaler = StandardScaler().fit(X)
+    probe = _probe_rows(X).astype(np.float32)
+    np.testing.assert_array_equal(fast_transform(scaler)(probe), scaler.transform(probe.astype(np.float64)))
+
+
+def test_fast_transform_leaves_input_untouched() -> None:
+    X = _training_data()
+    probe = _probe_rows(X)
+    before = probe.copy()
+    fast_transform(QuantileTransformer(n_quantiles=50).fit(X))(probe)
+    np.testing.assert_array_equal(probe, before)
+
+
+def test_fast_transform_skips_unsupported_scalers() -> None:
+    assert fast_transform(MinMaxScaler().fit(_training_data())) is None
+    assert fast_transform(None) is None
@@ -5,7 +5,7 @@ import time
 
 def monotonic_ms() -> int:
     """Return monotonic clock in milliseconds."""
-    return int(time.perf_counter() * 1000)
+    return time.perf_counter_ns() // 1_000_000
 
 
 def elapsed_ms(start_ms: int) -> int:
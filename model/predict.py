@@ -11,10 +11,12 @@ It supports TWO modes based on artifacts in model_dir:
   1) One-class baseline (IsolationForest + QuantileTransformer): files like model_iso_v1_oc.pkl, scaler_v1_oc.pkl
   2) Supervised XGBoost + Platt calibration: model_xgb_v*.pkl, calibrator_v*.pkl
 Feature order is locked by feature_names_*.json.
+predict_from_lightcurve reuses the loaded artifacts until latest.txt or the model file changes.
 """
 
 from __future__ import annotations
 import json, joblib, numpy as np, pandas as pd
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 from astropy.timeseries import BoxLeastSquares
@@ -43,15 +45,51 @@ def load_model(model_dir: str | Path = "/data/model") -> Dict[str, Any]:
         raise RuntimeError(f"Unknown latest artifact name: {latest}")
     return state
 
+@lru_cache(maxsize=4)
+def _load_model_cached(model_dir: str, stamp: tuple) -> Dict[str, Any]:
+    return load_model(model_dir)
+
+def _artifact_stamp(path: Path) -> Optional[tuple]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _cached_model(model_dir: str | Path) -> Dict[str, Any]:
+    """load_model, memoised on the (mtime, size) of latest.txt and of every artifact load_model reads."""
+    md = Path(model_dir).resolve()
+    latest = (md / "latest.txt").read_text().strip()
+    ver = latest.split(".pkl")[0].split("_", 2)[-1]
+    stamp = (latest,) + tuple(
+        _artifact_stamp(md / name)
+        for name in ("latest.txt", latest, f"scaler_{ver}.pkl", f"calibrator_{ver}.pkl", f"feature_names_{ver}.json")
+    )
+    return _load_model_cached(str(md), stamp)
+
 def _clean_flux(time: np.ndarray, flux: np.ndarray):
-    m = np.isfinite(time) & np.isfinite(flux)
+    m = np.isfinite(time)
+    m &= np.isfinite(flux)
+    n_in = m.size
     time, flux = time[m], flux[m]
     if len(time) < 200:
-        return time, flux, {"insufficient": True, "data_fraction_kept": float(np.mean(m))}
+        return time, flux, {"insufficient": True, "data_fraction_kept": len(time) / n_in if n_in else np.nan}
     med = float(np.median(flux))
-    mad = float(np.median(np.abs(flux - med))) + 1e-12
-    m2 = np.abs(flux - med) < 5.0 * 1.4826 * mad
-    return time[m2], flux[m2], {"insufficient": False, "data_fraction_kept": float(np.mean(m2))}
+    # One |flux - med| buffer serves both the MAD and the clip mask.
+    dev = np.abs(flux - med)
+    mad = float(np.median(dev)) + 1e-12
+    m2 = dev < 5.0 * 1.4826 * mad
+    return time[m2], flux[m2], {"insufficient": False, "data_fraction_kept": np.count_nonzero(m2) / len(flux)}
+
+@lru_cache(maxsize=8)
+def _bls_grids(period_min: float, period_max: float, n_periods: int,
+               dur_h_min: float, dur_h_max: float):
+    """Trial periods/durations (days); built once per parameter set and shared read-only."""
+    periods = np.linspace(period_min, period_max, n_periods)
+    durations = np.linspace(dur_h_min, dur_h_max, 20) / 24.0
+    periods.flags.writeable = False
+    durations.flags.writeable = False
+    return periods, durations
 
 def _bls_features(time: np.ndarray, flux: np.ndarray, meta: Optional[Dict[str, Any]] = None,
                   period_min: float = 0.5, period_max: float = 30.0, n_periods: int = 5000,
@@ -66,8 +104,8 @@ def _bls_features(time: np.ndarray, flux: np.ndarray, meta: Optional[Dict[str, A
     # normalize flux (should already be flattened PDCSAP)
     flux = flux / np.median(flux) - 1.0
 
-    periods = np.linspace(period_min, period_max, n_periods)
-    durations = np.linspace(dur_h_min, dur_h_max, 20) / 24.0
+    # Same linear grid and oversample as scripts/build_features.py, so features match training.
+    periods, durations = _bls_grids(period_min, period_max, n_periods, dur_h_min, dur_h_max)
 
     bls = BoxLeastSquares(time, flux)
     power = bls.power(periods, durations, oversample=5)
@@ -85,23 +123,31 @@ def _bls_features(time: np.ndarray, flux: np.ndarray, meta: Optional[Dict[str, A
     duty_cycle = duration / period if period > 0 else np.nan
     n_transits = baseline_days / period if period > 0 else np.nan
 
+    # Fold once: the 2*period fold is the same cycle count halved (exact in floating point),
+    # and duty_cycle/2 is the shared half-width of every window below. The fold keeps a true
+    # division: time * (1/period) can move samples across a window edge vs. training features.
+    cycles = (time - t0) / period
+    phase = cycles % 1.0
+    phase2 = (cycles * 0.5) % 1.0
+    half_w = duty_cycle * 0.5
+
     # secondary SNR at phase 0.5
-    phase = ((time - t0) / period) % 1.0
-    sec_in = np.abs(phase - 0.5) < (duration / period) / 2
-    sec_depth = float(np.median(flux[sec_in])) if sec_in.any() else np.nan
-    sec_snr = float(np.abs(sec_depth) / (np.std(flux[~sec_in]) + 1e-12)) if sec_in.any() else np.nan
+    sec_in = np.abs(phase - 0.5) < half_w
+    has_sec = bool(sec_in.any())
+    # Masked selections are fresh copies, so np.median may partition them in place.
+    sec_depth = float(np.median(flux[sec_in], overwrite_input=True)) if has_sec else np.nan
+    sec_snr = float(np.abs(sec_depth) / (np.std(flux[~sec_in]) + 1e-12)) if has_sec else np.nan
 
     # odd/even ratio (fold at 2*period)
-    phase2 = ((time - t0) / (2 * period)) % 1.0
-    in_even = (phase2 < (duration / (2 * period))) | (phase2 > 1 - (duration / (2 * period)))
-    in_odd = np.abs(phase2 - 0.5) < (duration / (2 * period))
-    depth_even = float(np.median(flux[in_even])) if in_even.any() else np.nan
-    depth_odd = float(np.median(flux[in_odd])) if in_odd.any() else np.nan
+    in_even = (phase2 < half_w) | (phase2 > 1 - half_w)
+    in_odd = np.abs(phase2 - 0.5) < half_w
+    depth_even = float(np.median(flux[in_even], overwrite_input=True)) if in_even.any() else np.nan
+    depth_odd = float(np.median(flux[in_odd], overwrite_input=True)) if in_odd.any() else np.nan
     odd_even_ratio = (depth_odd / depth_even) if np.isfinite(depth_odd) and np.isfinite(depth_even) and depth_even != 0 else np.nan
 
     rms_before = float(np.std(flux))
-    in_tr = np.abs(phase - 0) < (duration / period) / 2
-    rms_after = float(np.std(flux[~in_tr])) if (~in_tr).any() else np.nan
+    out_tr = phase >= half_w
+    rms_after = float(np.std(flux[out_tr])) if out_tr.any() else np.nan
 
     out.update({
         "period_days": period,
@@ -130,7 +176,7 @@ def features_from_lightcurve(time, flux, flux_err=None, meta: Optional[Dict[str,
 def predict_from_lightcurve(time, flux, flux_err=None, meta: Optional[Dict[str, Any]] = None,
                             model_dir: str | Path = "/data/model") -> Dict[str, Any]:
     """Compute features → load latest model → return score + summary."""
-    state = load_model(model_dir)
+    state = _cached_model(model_dir)
     feats = features_from_lightcurve(time, flux, flux_err, meta)
     fn = state["feature_names"]
     X = pd.DataFrame([feats]).reindex(columns=fn)
@@ -142,13 +188,11 @@ def predict_from_lightcurve(time, flux, flux_err=None, meta: Optional[Dict[str,
         s = (s - s.min()) / (s.max() - s.min() + 1e-12)
         score = float(s[0])
     else:
-        xgb = state["xgb"]
-        dm = xgb.DMatrix(X, feature_names=fn)
-        raw = state["model"].predict(dm)
+        # the calibrator runs the booster itself; otherwise predict in place (no DMatrix build)
         if state["calibrator"] is not None:
             score = float(state["calibrator"].predict_proba(X)[:, 1][0])
         else:
-            score = float(raw[0])
+            score = float(state["model"].inplace_predict(X)[0])
 
     return {
         "score": score,
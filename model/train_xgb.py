@@ -33,15 +33,19 @@ def main():
 
     non_feature = {"tic_id","warning","t0","label"}
     feature_names = [c for c in df.columns if c not in non_feature]
-    X = df[feature_names].fillna(df[feature_names].median())
+    # Training-set medians fill NaNs here and are saved so eval/inference impute the same values.
+    medians = df[feature_names].median()
+    X = df[feature_names].fillna(medians)
     y = df["label"].astype(int).to_numpy()
 
-    train_idx, temp_idx = train_test_split(df.index, test_size=0.30, random_state=args.seed, stratify=y)
+    # XGBoost bins features as float32 anyway; one contiguous float32 copy feeds every DMatrix.
+    Xv = np.ascontiguousarray(X.to_numpy(np.float32))
+    train_idx, temp_idx = train_test_split(np.arange(len(df)), test_size=0.30, random_state=args.seed, stratify=y)
     val_idx,   test_idx = train_test_split(temp_idx,  test_size=0.50, random_state=args.seed+1, stratify=y[temp_idx])
 
-    Xtr, ytr = X.iloc[train_idx], y[train_idx]
-    Xva, yva = X.iloc[val_idx],   y[val_idx]
-    Xte, yte = X.iloc[test_idx],  y[test_idx]
+    Xtr, ytr = Xv[train_idx], y[train_idx]
+    Xva, yva = Xv[val_idx],   y[val_idx]
+    Xte, yte = Xv[test_idx],  y[test_idx]
 
     dtr = xgb.DMatrix(Xtr, label=ytr, feature_names=feature_names)
     dva = xgb.DMatrix(Xva, label=yva, feature_names=feature_names)
@@ -74,19 +78,20 @@ def main():
         def __init__(self, booster, feature_names): self.booster=booster; self.feature_names=feature_names
         def fit(self, X, y): return self
         def predict_proba(self, X):
-            dm = xgb.DMatrix(X[self.feature_names], feature_names=self.feature_names)
-            p = self.booster.predict(dm)
+            Xf = X[self.feature_names] if isinstance(X, pd.DataFrame) else X
+            p = self.booster.inplace_predict(np.ascontiguousarray(Xf, dtype=np.float32))
             return np.c_[1-p, p]
 
     wrapper = _XGBWrapper(bst, feature_names)
     calib = CalibratedClassifierCV(wrapper, method="sigmoid", cv="prefit")
-    calib.fit(Xva, yva)
+    calib.fit(X.iloc[val_idx], yva)  # DataFrame, as the calibrator is fed at inference
 
     arti = Path(args.artifacts); arti.mkdir(parents=True, exist_ok=True)
     ver = args.version
     joblib.dump(bst,   arti / f"model_xgb_{ver}.pkl")
     joblib.dump(calib, arti / f"calibrator_{ver}.pkl")
     with open(arti / f"feature_names_{ver}.json","w") as f: json.dump(feature_names, f)
+    with open(arti / f"feature_medians_{ver}.json","w") as f: json.dump({k: float(v) for k, v in medians.items()}, f)
     with open(arti / f"metrics_{ver}.json","w") as f: json.dump(metrics, f, indent=2)
     with open(arti / "latest.txt","w") as f: f.write(f"model_xgb_{ver}.pkl")
     print("Saved artifacts to:", arti, "|", metrics)
@@ -7,9 +7,10 @@ Layout (defaults; can be overridden with --root/--processed/--interim):
   <root>/processed/labels.parquet                 (optional here; not used for feature build)
   <root>/processed/tic_meta.parquet               (optional: tmag, teff, rad, crowdsap, contratio)
 
+  <path given to --packed>                        (optional: all light curves in one table, see below)
+
 Outputs:
-  <root>/interim/features/TIC-<id>.parquet        (one-row feature parquet per TIC, resumable)
-  <root>/interim/features_all.parquet             (combined feature table, one row per TIC)
+  <root>/interim/features_all.parquet             (combined feature table, one row per TIC, resumable)
 
 CLI examples:
   python build_features.py --root . --workers 4
@@ -17,23 +18,75 @@ CLI examples:
 
 Notes:
 - BLS only (TLS optional later).
-- Resumable: skips TICs that already have a feature file unless --force.
+- --period-grid ofir samples frequencies per Ofir (2014) instead of the linear --n-periods grid.
+  Features then differ from the backend/model runtime (which use the linear grid), so only use
+  it together with a matching runtime change.
+- --packed PATH reads light curves from one parquet table (tic_id, time: list<double>,
+  flux: list<double>) in row groups of TASK_CHUNK_SIZE TICs instead of opening one file per TIC.
+  The table is packed from lightcurves/ when missing or with --force.
+- Resumable: skips TICs already present in features_all.parquet unless --force. Rows are streamed
+  to <interim>/features_all.parts/ and a part is committed every --checkpoint-every completed TICs,
+  so an interrupted run keeps its progress; the next run merges those parts into features_all.
 """
 
 from __future__ import annotations
 import argparse
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any, Iterable, List
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from astropy.timeseries import BoxLeastSquares
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+try:  # optional: fused fold kernel
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _clean_flux_loop(time: np.ndarray, flux: np.ndarray):
+    # Same steps as the NumPy path: finite filter, then a 5-sigma MAD clip, compacting the kept
+    # samples in place into two buffers instead of building N-length temporaries.
+    n = time.size
+    t_out = np.empty(n, dtype=np.float64)
+    f_out = np.empty(n, dtype=np.float64)
+    k = 0
+    for i in range(n):
+        if np.isfinite(time[i]) and np.isfinite(flux[i]):
+            t_out[k] = time[i]
+            f_out[k] = flux[i]
+            k += 1
+    if k < 200:
+        return t_out[:k], f_out[:k], (k / n) if n else np.nan, True
+    med = np.median(f_out[:k])
+    dev = np.empty(k, dtype=np.float64)
+    for i in range(k):
+        dev[i] = abs(f_out[i] - med)
+    mad = np.median(dev) + 1e-12
+    limit = 5.0 * 1.4826 * mad
+    j = 0
+    for i in range(k):
+        if dev[i] < limit:
+            t_out[j] = t_out[i]
+            f_out[j] = f_out[i]
+            j += 1
+    return t_out[:j], f_out[:j], j / k, False
+
+
+_clean_flux_jit = njit(cache=True)(_clean_flux_loop) if njit is not None else None
 
 
 def _clean_flux(time: np.ndarray, flux: np.ndarray):
+    if _clean_flux_jit is not None:
+        time, flux, frac, insufficient = _clean_flux_jit(
+            np.ascontiguousarray(time, dtype=np.float64), np.ascontiguousarray(flux, dtype=np.float64))
+        return time, flux, {"insufficient": insufficient, "data_fraction_kept": float(frac)}
     m = np.isfinite(time) & np.isfinite(flux)
     time, flux = time[m], flux[m]
     if len(time) < 200:
@@ -44,14 +97,122 @@ def _clean_flux(time: np.ndarray, flux: np.ndarray):
     return time[m2], flux[m2], {"insufficient": False, "data_fraction_kept": float(np.mean(m2))}
 
 
+# Ofir (2014) optimal frequency sampling for a Sun-like host: (2pi)^(2/3)/pi * R_sun/(G M_sun)^(1/3),
+# in day^(2/3); divided by baseline and oversampling it is Ofir's A, and A/3 is the step in f^(1/3).
+OFIR_A_SUN = 0.07565
+OFIR_OVERSAMPLE = 3
+
+
+# Chunks of TICs handed to one worker call; amortises task pickling and result round trips.
+TASK_CHUNK_SIZE = 32
+
+
+@lru_cache(maxsize=4)
+def _linear_grid(start: float, stop: float, num: int) -> np.ndarray:
+    """np.linspace built once per worker and shared read-only across TICs."""
+    grid = np.linspace(start, stop, num)
+    grid.flags.writeable = False
+    return grid
+
+
+@lru_cache(maxsize=4)
+def _duration_grid(dur_min_h: float, dur_max_h: float) -> np.ndarray:
+    durations = np.linspace(dur_min_h, dur_max_h, 20) / 24.0
+    durations.flags.writeable = False
+    return durations
+
+
+def _period_grid(cfg: Dict[str, Any], baseline_days: float) -> np.ndarray:
+    pmin, pmax = cfg["bls_period_days_min"], cfg["bls_period_days_max"]
+    if cfg.get("period_grid", "linear") != "ofir" or baseline_days <= 0:
+        return _linear_grid(pmin, pmax, cfg["bls_n_periods"])
+    # Uniform in f^(1/3): the transit-duration-limited resolution scales as f^(2/3), so short periods
+    # get the dense sampling they need and long periods stop being oversampled.
+    step = OFIR_A_SUN / (3 * baseline_days * OFIR_OVERSAMPLE)
+    lo, hi = (1.0 / pmax) ** (1 / 3), (1.0 / pmin) ** (1 / 3)
+    cube_roots = np.linspace(hi, lo, int(np.ceil((hi - lo) / step)) + 1)
+    return 1.0 / cube_roots ** 3
+
+
+def _fold_masks_numpy(time: np.ndarray, t0: float, period: float, duration: float):
+    phase = ((time - t0) / period) % 1.0
+    sec_in = np.abs(phase - 0.5) < (duration / period) / 2
+    in_transit = np.abs(phase - 0) < (duration / period) / 2
+    phase2 = ((time - t0) / (2 * period)) % 1.0
+    in_even = (phase2 < (duration / (2 * period))) | (phase2 > 1 - (duration / (2 * period)))
+    in_odd = np.abs(phase2 - 0.5) < (duration / (2 * period))
+    return sec_in, in_even, in_odd, in_transit
+
+
+def _fold_masks_loop(time: np.ndarray, t0: float, period: float, duration: float):
+    # Same expressions as _fold_masks_numpy, evaluated per sample with no full-length temporaries.
+    n = time.size
+    sec_in = np.empty(n, dtype=np.bool_)
+    in_even = np.empty(n, dtype=np.bool_)
+    in_odd = np.empty(n, dtype=np.bool_)
+    in_transit = np.empty(n, dtype=np.bool_)
+    half_w = (duration / period) / 2
+    half_w2 = duration / (2 * period)
+    period2 = 2 * period
+    for i in range(n):
+        phase = ((time[i] - t0) / period) % 1.0
+        phase2 = ((time[i] - t0) / period2) % 1.0
+        sec_in[i] = abs(phase - 0.5) < half_w
+        in_transit[i] = abs(phase - 0) < half_w
+        in_even[i] = (phase2 < half_w2) or (phase2 > 1 - half_w2)
+        in_odd[i] = abs(phase2 - 0.5) < half_w2
+    return sec_in, in_even, in_odd, in_transit
+
+
+# No fastmath: the masks must match the NumPy expressions bit for bit so features stay reproducible.
+_fold_masks_jit = njit(cache=True)(_fold_masks_loop) if njit is not None else None
+
+
+def _fold_masks(time: np.ndarray, t0: float, period: float, duration: float):
+    """Secondary, even, odd and primary in-transit masks from one fold of ``time``."""
+    if _fold_masks_jit is not None:
+        return _fold_masks_jit(np.ascontiguousarray(time, dtype=np.float64), t0, period, duration)
+    return _fold_masks_numpy(time, t0, period, duration)
+
+
+def _bls_power(bls: BoxLeastSquares, periods: np.ndarray, durations: np.ndarray, threads: int):
+    """BLS periodogram and its argmax; with threads > 1 the period grid is split across threads.
+
+    astropy's fast BLS kernel releases the GIL and scores each trial period independently, so
+    concatenated chunk results are identical to one call over the whole grid.
+    """
+    if threads <= 1 or len(periods) < 2 * threads:
+        power = bls.power(periods, durations, oversample=5, method="fast")
+        return power, int(np.argmax(power.power))
+    with ThreadPoolExecutor(max_workers=threads) as ex:
+        parts = list(ex.map(lambda chunk: bls.power(chunk, durations, oversample=5, method="fast"),
+                            np.array_split(periods, threads)))
+    # argmax over the concatenated powers keeps the first-occurrence tie-break of a single call
+    i = int(np.argmax(np.concatenate([part.power for part in parts])))
+    for part in parts:
+        if i < len(part.power):
+            return part, i
+        i -= len(part.power)
+    raise AssertionError("argmax outside the period grid")
+
+
 def _bls_features_from_parquet(parquet_path: Path,
                                cfg: Dict[str, Any],
                                meta_df: Optional[pd.DataFrame]) -> pd.Series:
     tic_id = int(parquet_path.stem.split('-')[1])
-    df = pd.read_parquet(parquet_path)
-    time = df['time'].to_numpy(float)
-    flux = df['flux'].to_numpy(float)
-
+    # Only time/flux are used; projecting skips decoding flux_err and any extra columns, and
+    # reading through Arrow hands single-chunk float64 columns to NumPy without a pandas copy.
+    table = pq.read_table(parquet_path, columns=["time", "flux"])
+    time = table.column("time").to_numpy().astype(np.float64, copy=False)
+    flux = table.column("flux").to_numpy().astype(np.float64, copy=False)
+    return _bls_features(tic_id, time, flux, cfg, meta_df)
+
+
+def _bls_features(tic_id: int,
+                  time: np.ndarray,
+                  flux: np.ndarray,
+                  cfg: Dict[str, Any],
+                  meta_df: Optional[pd.DataFrame]) -> pd.Series:
     time, flux, flags = _clean_flux(time, flux)
     out = {"tic_id": tic_id, "warning": None, "data_fraction_kept": flags.get("data_fraction_kept", np.nan)}
 
@@ -63,12 +224,11 @@ def _bls_features_from_parquet(parquet_path: Path,
     flux = flux / np.median(flux) - 1.0
 
     # grids
-    periods = np.linspace(cfg["bls_period_days_min"], cfg["bls_period_days_max"], cfg["bls_n_periods"])
-    durations = np.linspace(cfg["duration_hours_min"], cfg["duration_hours_max"], 20) / 24.0
+    periods = _period_grid(cfg, float(time.max() - time.min()))
+    durations = _duration_grid(cfg["duration_hours_min"], cfg["duration_hours_max"])
 
     bls = BoxLeastSquares(time, flux)
-    power = bls.power(periods, durations, oversample=5)
-    i = int(np.argmax(power.power))
+    power, i = _bls_power(bls, periods, durations, cfg.get("bls_threads", 1))
     period = float(power.period[i])
     t0 = float(power.transit_time[i])
     duration = float(power.duration[i])
@@ -79,22 +239,21 @@ def _bls_features_from_parquet(parquet_path: Path,
     duty_cycle = (duration / period) if period > 0 else np.nan
     n_transits = (baseline_days / period) if period > 0 else np.nan
 
+    sec_in, in_even, in_odd, in_transit = _fold_masks(time, t0, period, duration)
+
     # secondary eclipse SNR at phase 0.5
-    phase = ((time - t0) / period) % 1.0
-    sec_in = np.abs(phase - 0.5) < (duration / period) / 2
-    sec_depth = float(np.median(flux[sec_in])) if sec_in.any() else np.nan
-    sec_snr = float(np.abs(sec_depth) / (np.std(flux[~sec_in]) + 1e-12)) if sec_in.any() else np.nan
+    # Masked selections are fresh copies, so np.median may partition them in place
+    # (overwrite_input skips its internal copy; np.median is already partition-based).
+    has_sec = bool(sec_in.any())
+    sec_depth = float(np.median(flux[sec_in], overwrite_input=True)) if has_sec else np.nan
+    sec_snr = float(np.abs(sec_depth) / (np.std(flux[~sec_in]) + 1e-12)) if has_sec else np.nan
 
     # odd-even ratio (fold at 2*period)
-    phase2 = ((time - t0) / (2 * period)) % 1.0
-    in_even = (phase2 < (duration / (2 * period))) | (phase2 > 1 - (duration / (2 * period)))
-    in_odd = np.abs(phase2 - 0.5) < (duration / (2 * period))
-    depth_even = float(np.median(flux[in_even])) if in_even.any() else np.nan
-    depth_odd = float(np.median(flux[in_odd])) if in_odd.any() else np.nan
+    depth_even = float(np.median(flux[in_even], overwrite_input=True)) if in_even.any() else np.nan
+    depth_odd = float(np.median(flux[in_odd], overwrite_input=True)) if in_odd.any() else np.nan
     odd_even_ratio = (depth_odd / depth_even) if np.isfinite(depth_odd) and np.isfinite(depth_even) and depth_even != 0 else np.nan
 
     rms_before = float(np.std(flux))
-    in_transit = np.abs(phase - 0) < (duration / period) / 2
     rms_after = float(np.std(flux[~in_transit])) if (~in_transit).any() else np.nan
 
     out.update({
@@ -123,11 +282,165 @@ def _bls_features_from_parquet(parquet_path: Path,
     return pd.Series(out)
 
 
-def _write_one(tic_parquet: Path, out_dir: Path, cfg: Dict[str, Any], meta_df: Optional[pd.DataFrame]) -> Path:
-    s = _bls_features_from_parquet(tic_parquet, cfg, meta_df)
-    out_path = out_dir / f"TIC-{int(tic_parquet.stem.split('-')[1])}.parquet"
-    s.to_frame().T.to_parquet(out_path)
-    return out_path
+# TIC meta table of the current worker process, loaded once by _init_worker.
+_WORKER_META: Optional[pd.DataFrame] = None
+
+
+def _load_meta(meta_path: Path) -> Optional[pd.DataFrame]:
+    return pd.read_parquet(meta_path).set_index("tic_id") if meta_path.exists() else None
+
+
+def _init_worker(meta_path: Path) -> None:
+    global _WORKER_META
+    _WORKER_META = _load_meta(meta_path)
+
+
+def _features_task(tic_parquets: List[Path], cfg: Dict[str, Any]) -> List[pd.Series]:
+    return [_bls_features_from_parquet(p, cfg, _WORKER_META) for p in tic_parquets]
+
+
+def _pack_lightcurves(tic_files: List[Path], out_path: Path) -> None:
+    """Write every TIC-<id>.parquet as one row of a (tic_id, time[], flux[]) table."""
+    schema = pa.schema([("tic_id", pa.int64()), ("time", pa.list_(pa.float64())), ("flux", pa.list_(pa.float64()))])
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    with pq.ParquetWriter(tmp_path, schema) as writer:
+        for start in range(0, len(tic_files), TASK_CHUNK_SIZE):
+            batch = tic_files[start:start + TASK_CHUNK_SIZE]
+            tables = [pq.read_table(p, columns=["time", "flux"]) for p in batch]
+            offsets = pa.array(np.cumsum([0] + [t.num_rows for t in tables]), type=pa.int32())
+            columns = {
+                name: pa.ListArray.from_arrays(offsets, pa.concat_arrays(
+                    [t.column(name).combine_chunks().cast(pa.float64()) for t in tables]))
+                for name in ("time", "flux")
+            }
+            ids = pa.array([int(p.stem.split('-')[1]) for p in batch], type=pa.int64())
+            writer.write_table(pa.table({"tic_id": ids, **columns}, schema=schema))
+    os.replace(tmp_path, out_path)
+
+
+def _packed_groups(packed_path: Path) -> List[tuple]:
+    """(row group, [tic ids]) for every row group of the packed table."""
+    pf = pq.ParquetFile(packed_path)
+    return [(rg, pf.read_row_group(rg, columns=["tic_id"]).column(0).to_pylist()) for rg in range(pf.num_row_groups)]
+
+
+@lru_cache(maxsize=2)
+def _packed_file(packed_path: str) -> pq.ParquetFile:
+    return pq.ParquetFile(packed_path, memory_map=True)
+
+
+def _features_packed_task(packed_path: str, row_group: int, tic_ids: List[int], cfg: Dict[str, Any]) -> List[pd.Series]:
+    table = _packed_file(packed_path).read_row_group(row_group)
+    wanted = set(tic_ids)
+    times, fluxes = table.column("time"), table.column("flux")
+    rows = []
+    for i, tic in enumerate(table.column("tic_id").to_pylist()):
+        if tic in wanted:
+            # List values come straight out of the Arrow buffer (zero-copy when there are no nulls).
+            time = times[i].values.to_numpy(zero_copy_only=False)
+            flux = fluxes[i].values.to_numpy(zero_copy_only=False)
+            rows.append(_bls_features(tic, time, flux, cfg, _WORKER_META))
+    return rows
+
+
+# Rows per row group of features_all; pyarrow encodes and flushes one group at a time.
+FEATURES_ROW_GROUP = 8192
+
+# Fixed layout of features_all and of its parts, so rows can be streamed out as TICs complete
+# whatever columns a given chunk happens to carry.
+META_COLUMNS = ["tmag", "teff", "rad", "crowdsap", "contratio"]
+FEATURES_SCHEMA = pa.schema(
+    [("tic_id", pa.int64()), ("warning", pa.string())]
+    + [(name, pa.float64()) for name in (
+        "data_fraction_kept", "period_days", "duration_hours", "depth_ppm", "snr", "t0", "duty_cycle",
+        "n_transits", "odd_even_depth_ratio", "secondary_snr", "in_vs_out_rms", "rms_before", "rms_after",
+        *META_COLUMNS)]
+)
+
+
+def _conform(table: pa.Table) -> pa.Table:
+    """Cast a features table to FEATURES_SCHEMA, filling absent columns with nulls."""
+    columns = [
+        table.column(f.name).cast(f.type) if f.name in table.column_names else pa.nulls(table.num_rows, f.type)
+        for f in FEATURES_SCHEMA
+    ]
+    return pa.Table.from_arrays(columns, schema=FEATURES_SCHEMA)
+
+
+def _rows_table(rows: List[pd.Series]) -> pa.Table:
+    return _conform(pa.Table.from_pandas(pd.DataFrame(rows).infer_objects(), preserve_index=False))
+
+
+def _part_files(parts_dir: Path) -> List[Path]:
+    return sorted(parts_dir.glob("part-*.parquet"))
+
+
+class _FeatureParts:
+    """Streams feature rows into part files of one ParquetWriter each, in arrival order.
+
+    checkpoint() closes the open part and renames it into place, so an interrupted run keeps every
+    checkpointed TIC; _write_combined later merges the parts into features_all.
+    """
+
+    def __init__(self, parts_dir: Path):
+        parts_dir.mkdir(parents=True, exist_ok=True)
+        for stale in parts_dir.glob("part-*.parquet.tmp"):
+            stale.unlink()
+        self._dir = parts_dir
+        self._next = len(_part_files(parts_dir))
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._buffer: List[pd.Series] = []
+
+    def _path(self) -> Path:
+        return self._dir / f"part-{self._next:05d}.parquet"
+
+    def add(self, rows: List[pd.Series]) -> None:
+        self._buffer.extend(rows)
+        if len(self._buffer) >= FEATURES_ROW_GROUP:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self._path().with_suffix(".parquet.tmp"), FEATURES_SCHEMA,
+                                            compression="zstd")
+        self._writer.write_table(_rows_table(self._buffer), row_group_size=FEATURES_ROW_GROUP)
+        self._buffer.clear()
+
+    def checkpoint(self) -> None:
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            os.replace(self._path().with_suffix(".parquet.tmp"), self._path())
+            self._next += 1
+
+
+def _done_ids(sources: Iterable[Path]) -> set:
+    return {int(t) for p in sources for t in pq.read_table(p, columns=["tic_id"]).column(0).to_pylist()}
+
+
+def _write_combined(base: Optional[Path], parts_dir: Path, out_path: Path) -> pd.DataFrame:
+    """Merge base (the previous features_all, if any) and the parts into features_all, sorted by tic_id.
+
+    Parts win over base for a repeated TIC. Meta columns that are null throughout are dropped, as
+    rows only carry them for TICs with a tic_meta entry. features_all is replaced atomically and the
+    merged parts are removed.
+    """
+    parts = _part_files(parts_dir)
+    sources = ([base] if base is not None and base.exists() else []) + parts
+    if not sources:
+        raise RuntimeError(f"No feature rows to write to {out_path}")
+    feats_all = (pa.concat_tables([_conform(pq.read_table(p)) for p in sources]).to_pandas()
+                 .drop_duplicates("tic_id", keep="last").sort_values("tic_id").reset_index(drop=True))
+    feats_all = feats_all.drop(columns=[c for c in META_COLUMNS if feats_all[c].isna().all()])
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    feats_all.to_parquet(tmp_path, row_group_size=FEATURES_ROW_GROUP, compression="zstd")
+    os.replace(tmp_path, out_path)
+    for part in parts:
+        part.unlink()
+    return feats_all
 
 
 def main():
@@ -136,10 +449,15 @@ def main():
     ap.add_argument("--processed", default=None, help="Override processed/ path")
     ap.add_argument("--interim", default=None, help="Override interim/ path")
     ap.add_argument("--workers", type=int, default=4)
-    ap.add_argument("--force", action="store_true", help="Recompute even if per-TIC features exist")
+    ap.add_argument("--bls-threads", type=int, default=1,
+                    help="Threads per TIC over the period grid (for fewer TICs than cores; workers x threads <= cores)")
+    ap.add_argument("--force", action="store_true", help="Recompute even if features_all already has the TIC")
+    ap.add_argument("--packed", default=None, help="Read light curves from this packed table (built if missing)")
+    ap.add_argument("--checkpoint-every", type=int, default=200, help="Commit a part of new rows after this many TICs")
     ap.add_argument("--period-min", type=float, default=0.5)
     ap.add_argument("--period-max", type=float, default=30.0)
-    ap.add_argument("--n-periods", type=int, default=5000)
+    ap.add_argument("--n-periods", type=int, default=5000, help="Linear grid size (ignored with --period-grid ofir)")
+    ap.add_argument("--period-grid", choices=["linear", "ofir"], default="linear")
     ap.add_argument("--dur-min-h", type=float, default=0.5)
     ap.add_argument("--dur-max-h", type=float, default=10.0)
     args = ap.parse_args()
@@ -148,51 +466,77 @@ def main():
     processed = Path(args.processed).resolve() if args.processed else root / "processed"
     interim = Path(args.interim).resolve() if args.interim else root / "interim"
     lcs_dir = processed / "lightcurves"
-    feats_dir = interim / "features"
-    feats_dir.mkdir(parents=True, exist_ok=True)
     interim.mkdir(parents=True, exist_ok=True)
+    out_all = interim / "features_all.parquet"
 
     labels_path = processed / "labels.parquet"  # not required here
     meta_path = processed / "tic_meta.parquet"
-    meta_df = pd.read_parquet(meta_path).set_index("tic_id") if meta_path.exists() else None
 
     cfg = {
         "bls_period_days_min": args.period_min,
         "bls_period_days_max": args.period_max,
         "bls_n_periods": args.n_periods,
+        "period_grid": args.period_grid,
+        "bls_threads": args.bls_threads,
         "duration_hours_min": args.dur_min_h,
         "duration_hours_max": args.dur_max_h,
     }
 
-    tic_files = sorted(lcs_dir.glob("TIC-*.parquet"))
-    if not tic_files:
-        raise FileNotFoundError(f"No TIC-*.parquet found in {lcs_dir}")
-
-    done_ids = {int(p.stem.split('-')[1]) for p in feats_dir.glob("TIC-*.parquet")}
-    tasks: List[Path] = []
-    for p in tic_files:
-        tic = int(p.stem.split('-')[1])
-        if not args.force and tic in done_ids:
-            continue
-        tasks.append(p)
-
-    print(f"Total TICs: {len(tic_files)} | To process: {len(tasks)} | Skipping: {len(tic_files) - len(tasks)}")
-    if tasks:
-        with ThreadPoolExecutor(max_workers=args.workers) as ex:
-            futures = [ex.submit(_write_one, p, feats_dir, cfg, meta_df) for p in tasks]
-            for i, fut in enumerate(as_completed(futures), 1):
-                _ = fut.result()
-                if i % 50 == 0 or i == len(tasks):
-                    print(f"  wrote {i}/{len(tasks)}")
-
-    # Combine per-TIC feature rows → features_all.parquet
-    all_feat_files = sorted(feats_dir.glob("TIC-*.parquet"))
-    if not all_feat_files:
-        raise RuntimeError(f"No per-TIC feature files in {feats_dir}")
-    df_list = [pd.read_parquet(p) for p in all_feat_files]
-    feats_all = pd.concat(df_list, ignore_index=True).sort_values("tic_id").reset_index(drop=True)
-    out_all = interim / "features_all.parquet"
-    feats_all.to_parquet(out_all)
+    packed_path = Path(args.packed).resolve() if args.packed else None
+    if packed_path is None or args.force or not packed_path.exists():
+        tic_files = sorted(lcs_dir.glob("TIC-*.parquet"))
+        if not tic_files:
+            raise FileNotFoundError(f"No TIC-*.parquet found in {lcs_dir}")
+        if packed_path is not None:
+            _pack_lightcurves(tic_files, packed_path)
+            print(f"Packed {len(tic_files)} light curves into {packed_path}")
+
+    # Parts left by an interrupted run are skipped here and merged at the end, unless --force.
+    parts_dir = interim / "features_all.parts"
+    if args.force:
+        for part in _part_files(parts_dir):
+            part.unlink()
+    base = None if args.force else out_all
+    done_ids = _done_ids(([out_all] if out_all.exists() and not args.force else []) + _part_files(parts_dir))
+    workers = max(1, min(args.workers, os.cpu_count() or 1))
+    if packed_path is not None:
+        # One job per row group; each worker reads its group from the memory-mapped table.
+        groups = _packed_groups(packed_path)
+        n_total = sum(len(ids) for _, ids in groups)
+        pending = [(rg, [t for t in ids if t not in done_ids]) for rg, ids in groups]
+        jobs = [(_features_packed_task, (str(packed_path), rg, ids, cfg)) for rg, ids in pending if ids]
+        n_tasks = sum(len(ids) for _, ids in pending)
+    else:
+        n_total = len(tic_files)
+        tasks = [p for p in tic_files if int(p.stem.split('-')[1]) not in done_ids]
+        # Small enough that every worker still gets several chunks to balance load.
+        chunk = max(1, min(TASK_CHUNK_SIZE, len(tasks) // (workers * 4)))
+        jobs = [(_features_task, (tasks[i:i + chunk], cfg)) for i in range(0, len(tasks), chunk)]
+        n_tasks = len(tasks)
+
+    print(f"Total TICs: {n_total} | To process: {n_tasks} | Skipping: {n_total - n_tasks}")
+    # Rows are streamed to part files as they complete and merged into one sorted table at the end;
+    # no per-TIC files are written or re-read.
+    parts = _FeatureParts(parts_dir)
+    if jobs:
+        # BLS is CPU-bound and threads serialise its Python-level parts on the GIL, so use
+        # processes; each worker loads the meta table once instead of unpickling it per task.
+        workers = min(workers, len(jobs))
+        n_done = last_checkpoint = 0
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(meta_path,)) as ex:
+            futures = [ex.submit(fn, *fn_args) for fn, fn_args in jobs]
+            for fut in as_completed(futures):
+                rows = fut.result()
+                parts.add(rows)
+                n_done += len(rows)
+                print(f"  computed {n_done}/{n_tasks}")
+                if n_done - last_checkpoint >= args.checkpoint_every:
+                    parts.checkpoint()
+                    last_checkpoint = n_done
+    parts.checkpoint()
+
+    feats_all = _write_combined(base, parts_dir, out_all)
+    parts_dir.rmdir()
     print(f"Wrote combined features: {out_all} | rows: {len(feats_all)}")
 
     # Optional echo for automation
@@ -202,7 +546,7 @@ def main():
         "features_all": str(out_all),
         "n_tics": len(feats_all),
         "config": cfg,
-        "has_meta": meta_df is not None,
+        "has_meta": meta_path.exists(),
     }
     print(json.dumps(summary, indent=2))
 
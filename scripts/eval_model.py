@@ -23,6 +23,7 @@ Examples:
 from __future__ import annotations
 import argparse
 import json
+import warnings
 from pathlib import Path
 from typing import Dict, Any, Tuple, Optional, List
 
@@ -57,14 +58,29 @@ def load_artifacts(artifacts_dir: Path) -> Dict[str, Any]:
         state["needs_xgb"] = True
     else:
         raise RuntimeError(f"Unknown latest model file: {latest}")
+    # Training-time NaN fill values (written by model/train_xgb.py); older artifacts lack them.
+    medians_path = artifacts_dir / f"feature_medians_{ver}.json"
+    if medians_path.exists():
+        med = json.loads(medians_path.read_text())
+        state["medians"] = np.array([med.get(c, np.nan) for c in state["feature_names"]], dtype=float)
+    else:
+        state["medians"] = None
     return state
 
 
 def predict_scores(X: pd.DataFrame, state: Dict[str, Any]) -> np.ndarray:
-    # Ensure feature order and NaN handling match training
+    # Ensure feature order and NaN handling match training; one float64 copy, filled in place
     fn = state["feature_names"]
-    X = X.reindex(columns=fn)
-    X = X.fillna({c: X[c].median() for c in fn})
+    Xv = X.to_numpy(dtype=float, copy=True) if list(X.columns) == fn else X.reindex(columns=fn).to_numpy(dtype=float)
+    medians = state.get("medians")
+    if medians is None:
+        # older artifacts: fall back to this table's column medians
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns stay NaN, as with fillna
+            medians = np.nanmedian(Xv, axis=0)
+    np.copyto(Xv, medians[None, :], where=np.isnan(Xv))
+    # Name the columns for sklearn/calibrators without copying the array again
+    X = pd.DataFrame(Xv, columns=fn, index=X.index, copy=False)
 
     if state["mode"] == "one_class":
         Xn = state["scaler"].transform(X)
@@ -72,13 +88,12 @@ def predict_scores(X: pd.DataFrame, state: Dict[str, Any]) -> np.ndarray:
         s = (s - s.min()) / (s.max() - s.min() + 1e-12)  # map to 0..1
         return s
     else:
-        dm = state["xgb"].DMatrix(X, feature_names=state["feature_names"])
-        raw = state["model"].predict(dm)
         if state["calibrator"] is not None:
-            # Calibrator expects DataFrame
+            # Calibrator expects DataFrame (and runs the booster itself)
             prob = state["calibrator"].predict_proba(X)[:, 1]
             return prob
-        return raw
+        # inplace_predict scores the float32 array directly, skipping the DMatrix copy
+        return state["model"].inplace_predict(Xv.astype(np.float32))
 
 
 def compute_metrics(y_true: np.ndarray, y_score: np.ndarray) -> Dict[str, Any]:
@@ -144,7 +159,7 @@ def main():
     state = load_artifacts(artifacts)
     # Build X using ONLY feature columns saved at training time
     fn = state["feature_names"]
-    X = df[fn].copy()
+    X = df[fn]
     y = df["label"].astype(int).to_numpy()
     scores = predict_scores(X, state)
 
@@ -155,8 +170,8 @@ def main():
     print(json.dumps(metrics, indent=2))
 
     # Attach scores for export/inspection
-    df_scored = df.copy()
-    df_scored["score"] = scores
+    df["score"] = scores
+    df_scored = df
 
     # threshold summary (if provided and labels include 0/1)
     if args.threshold is not None and len(np.unique(y)) > 1:
@@ -180,7 +195,7 @@ def main():
     # Exports
     if args.export:
         interim.mkdir(parents=True, exist_ok=True)
-        (interim / "scored.parquet").write_bytes(df_scored.to_parquet(index=False))
+        df_scored.to_parquet(interim / "scored.parquet", index=False, compression="zstd")
         topk_path = interim / f"top_{args.topk}_candidates.csv"
         topk.to_csv(topk_path, index=False)
         print("Wrote:", interim / "scored.parquet")
@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 import argparse
-import json
 import shutil
+import sys
 from pathlib import Path
 from typing import Any
 
 import numpy as np
+import orjson
 import pandas as pd
+import pyarrow as pa
 
 try:
     from lightkurve import LightkurveError, search_lightcurve  # type: ignore
@@ -34,15 +36,7 @@ def _cleanup_path_from_exception(exc: LightkurveError) -> None:
 
 
 def _unique(seq: list[Any]) -> list[Any]:
-    seen: set[Any] = set()
-    ordered: list[Any] = []
-    for item in seq:
-        key = item
-        if key in seen:
-            continue
-        seen.add(key)
-        ordered.append(item)
-    return ordered
+    return list(dict.fromkeys(seq))
 
 
 def _to_numpy(values: Any) -> np.ndarray:
@@ -106,27 +100,94 @@ def write_parquet(df: pd.DataFrame, output_dir: Path, tic_id: int) -> Path:
     output_dir.mkdir(parents=True, exist_ok=True)
     path = output_dir / "lightcurves" / f"TIC-{tic_id}.parquet"
     path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(path, index=False)
+    # Float columns only: byte-stream-split pages compress about twice as well under zstd.
+    df.to_parquet(path, index=False, compression="zstd", compression_level=3, use_dictionary=False,
+                  column_encoding=dict.fromkeys(df.columns, "BYTE_STREAM_SPLIT"))
     return path
 
 
-def call_backend(df: pd.DataFrame, backend_url: str) -> dict[str, Any]:
-    payload: dict[str, Any] = {
-        "time": df["time"].tolist(),
-        "flux": df["flux"].tolist(),
-    }
-    if "flux_err" in df.columns:
-        payload["flux_err"] = df["flux_err"].tolist()
+ARROW_COLUMNS = ("time", "flux", "flux_err")
+# Matches MAX_BATCH_SIZE on the backend's /predict/from_lightcurves route.
+MAX_BACKEND_BATCH = 64
+# Read timeout for one batch POST: 60 s per curve, capped so a stalled backend fails in minutes.
+BATCH_TIMEOUT_CAP_S = 300.0
+
+
+def _record_batch(df: pd.DataFrame, columns: tuple[str, ...]) -> pa.RecordBatch:
+    arrays = [
+        pa.array(df[name].to_numpy(dtype=np.float64)) if name in df.columns else pa.nulls(len(df), pa.float64())
+        for name in columns
+    ]
+    return pa.record_batch(arrays, names=list(columns))
+
 
+def _arrow_payload(dfs: list[pd.DataFrame]) -> bytes:
+    # Every batch in a stream shares one schema; curves without flux_err send it as nulls.
+    columns = tuple(name for name in ARROW_COLUMNS if any(name in df.columns for df in dfs))
+    batches = [_record_batch(df, columns) for df in dfs]
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batches[0].schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def call_backend(df: pd.DataFrame, backend_url: str) -> dict[str, Any]:
+    # Ship the float64 columns as one Arrow IPC stream instead of JSON number lists.
     with httpx.Client(timeout=60.0) as client:
-        resp = client.post(f"{backend_url.rstrip('/')}/predict/from_lightcurve", json=payload)
+        resp = client.post(
+            f"{backend_url.rstrip('/')}/predict/from_arrow",
+            content=_arrow_payload([df]),
+            headers={"Content-Type": "application/vnd.apache.arrow.stream"},
+        )
         resp.raise_for_status()
-        return resp.json()
+        return orjson.loads(resp.content)
+
+
+def call_backend_batch(
+    dfs: list[pd.DataFrame],
+    backend_url: str,
+    max_batch: int = MAX_BACKEND_BATCH,
+) -> list[dict[str, Any]]:
+    """Score several light curves with one POST per ``max_batch`` curves; results keep input order."""
+    max_batch = min(max_batch, MAX_BACKEND_BATCH)
+    results: list[dict[str, Any]] = []
+    with httpx.Client(timeout=min(60.0 * max_batch, BATCH_TIMEOUT_CAP_S)) as client:
+        for start in range(0, len(dfs), max_batch):
+            resp = client.post(
+                f"{backend_url.rstrip('/')}/predict/from_lightcurves",
+                content=_arrow_payload(dfs[start:start + max_batch]),
+                headers={"Content-Type": "application/vnd.apache.arrow.stream"},
+            )
+            resp.raise_for_status()
+            for item in orjson.loads(resp.content)["results"]:
+                item["index"] += start
+                results.append(item)
+    return results
+
+
+def _print_json(payload: Any) -> None:
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    sys.stdout.buffer.flush()
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Fetch a TESS light curve and prepare it for the backend.")
-    parser.add_argument("tic_id", type=int, help="TIC identifier")
+    parser.add_argument("tic_id", type=int, nargs="?", help="TIC identifier")
+    parser.add_argument(
+        "--batch-tics",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Fetch several TICs and score them with batched backend calls",
+    )
+    parser.add_argument(
+        "--max-batch",
+        type=int,
+        default=MAX_BACKEND_BATCH,
+        help=f"Light curves per batched backend request (default: {MAX_BACKEND_BATCH})",
+    )
     parser.add_argument("--sector", type=int, help="Optional TESS sector to restrict the search")
     parser.add_argument(
         "--output-dir",
@@ -138,7 +199,7 @@ def main() -> None:
         "--backend",
         type=str,
         default=None,
-        help="FastAPI base URL; if provided, call /predict/from_lightcurve",
+        help="FastAPI base URL; if provided, call /predict/from_arrow",
     )
     parser.add_argument(
         "--flux-column",
@@ -154,14 +215,34 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    df = download_lightcurve(args.tic_id, args.sector, flux_column=args.flux_column, author=args.author)
-    parquet_path = write_parquet(df, args.output_dir, args.tic_id)
-    print(f"Saved parquet to {parquet_path}")
+    tics = list(args.batch_tics or [])
+    if args.tic_id is not None:
+        tics.insert(0, args.tic_id)
+    if not tics:
+        parser.error("provide a tic_id or --batch-tics")
 
-    if args.backend:
-        prediction = call_backend(df, args.backend)
-        print(json.dumps(prediction, indent=2))
+    if not args.batch_tics:
+        df = download_lightcurve(args.tic_id, args.sector, flux_column=args.flux_column, author=args.author)
+        parquet_path = write_parquet(df, args.output_dir, args.tic_id)
+        print(f"Saved parquet to {parquet_path}")
 
+        if args.backend:
+            prediction = call_backend(df, args.backend)
+            _print_json(prediction)
+        return
+
+    dfs: list[pd.DataFrame] = []
+    for tic in tics:
+        df = download_lightcurve(tic, args.sector, flux_column=args.flux_column, author=args.author)
+        parquet_path = write_parquet(df, args.output_dir, tic)
+        print(f"Saved parquet to {parquet_path}")
+        dfs.append(df)
+
+    if args.backend:
+        results = call_backend_batch(dfs, args.backend, max_batch=max(1, args.max_batch))
+        for tic, item in zip(tics, results):
+            item["tic_id"] = tic
+        _print_json(results)
 
 if __name__ == "__main__":
     main()
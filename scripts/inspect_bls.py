@@ -1,12 +1,12 @@
 import numpy as np
-import pandas as pd
+import pyarrow.parquet as pq
 from astropy.timeseries import BoxLeastSquares
 
 path = 'data/processed/lightcurves/TIC-286923464.parquet'
-df = pd.read_parquet(path)
-print('rows', len(df))
-flux = df['flux'].to_numpy()
-time = df['time'].to_numpy()
+table = pq.read_table(path, columns=['time', 'flux'], memory_map=True)
+print('rows', table.num_rows)
+flux = table.column('flux').to_numpy()
+time = table.column('time').to_numpy()
 flux = flux / np.median(flux) - 1
 bls = BoxLeastSquares(time, flux)
 periods = np.linspace(0.5, 30.0, 5000)
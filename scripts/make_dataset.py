@@ -26,12 +26,17 @@ import logging
 import os
 import re
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Iterable, List, Optional, Tuple
 
+import httpx
+import joblib
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 # Third-party astro libs
 import lightkurve as lk
@@ -45,6 +50,9 @@ DEFAULT_LIMIT = 300              # cap for hackathon runs
 DEFAULT_PREFER_EXPTIME = 120     # 2-min cadence
 DEFAULT_MAX_SECTORS = 1          # fastest
 MAST_TIMEOUT = 60                # seconds
+MAST_DOWNLOAD_URL = "https://mast.stsci.edu/api/v0.1/Download/file"
+DEFAULT_PARQUET_COMPRESSION = "zstd"  # smaller than snappy for numeric series; lz4 writes fastest
+ZSTD_LEVEL = 3
 
 
 # --------- Logging ---------
@@ -60,6 +68,52 @@ mast_conf.timeout = MAST_TIMEOUT
 
 
 # --------- IO utils ---------
+# Light-curve parquet layout; fixed so each write skips pandas schema inference.
+LC_SCHEMA = pa.schema([("time", pa.float64()), ("flux", pa.float32()), ("flux_err", pa.float32())])
+
+
+def write_lightcurve(out_path: Path, time, flux, flux_err=None, compression: str = DEFAULT_PARQUET_COMPRESSION) -> int:
+    """Write time/flux[/flux_err] straight from NumPy; returns the row count."""
+    arrays = [pa.array(np.asarray(time, "float64")), pa.array(np.asarray(flux, "float32"))]
+    if flux_err is not None:
+        arrays.append(pa.array(np.asarray(flux_err, "float32")))
+    schema = pa.schema(list(LC_SCHEMA)[:len(arrays)])
+    table = pa.Table.from_arrays(arrays, schema=schema)
+    # One row group per curve with 1 MiB pages. Dense float columns get no dictionary pages;
+    # only the monotonic time column keeps min/max statistics, the flux ones prune nothing.
+    # BYTE_STREAM_SPLIT groups the sign/exponent bytes of these slowly varying floats, which
+    # roughly halves the compressed size (parquet's DELTA encodings are integer-only).
+    pq.write_table(table, out_path, row_group_size=max(1, table.num_rows), data_page_size=1 << 20,
+                   compression=compression,
+                   compression_level=ZSTD_LEVEL if compression == "zstd" else None,
+                   use_dictionary=False, write_statistics=["time"], data_page_version="2.0",
+                   column_encoding=dict.fromkeys(schema.names, "BYTE_STREAM_SPLIT"))
+    return table.num_rows
+
+
+LC_INDEX_NAME = "_index.parquet"
+
+
+def load_lc_index(lc_out: Path) -> dict:
+    """tic_id -> rows for saved light curves, from lc_out/_index.parquet.
+
+    Without an index (first run, or after deleting it to resync) the directory is scanned once.
+    """
+    index_path = lc_out / LC_INDEX_NAME
+    if index_path.exists():
+        table = pq.read_table(index_path, columns=["tic_id", "rows"])
+        return dict(zip(table.column("tic_id").to_pylist(), table.column("rows").to_pylist()))
+    return {int(p.stem.split("-")[1]): pq.read_metadata(p).num_rows for p in lc_out.glob("TIC-*.parquet")}
+
+
+def write_lc_index(lc_out: Path, index: dict) -> None:
+    tics = sorted(index)
+    table = pa.table({"tic_id": pa.array(tics, pa.int64()), "rows": pa.array([index[t] for t in tics], pa.int64())})
+    tmp = lc_out / (LC_INDEX_NAME + ".tmp")
+    pq.write_table(table, tmp)
+    os.replace(tmp, lc_out / LC_INDEX_NAME)
+
+
 def ensure_dirs(base: Path) -> Tuple[Path, Path, Path, Path]:
     raw = base / "raw"
     proc = base / "processed"
@@ -102,10 +156,8 @@ def find_disposition_column(df: pd.DataFrame) -> str:
 
 
 def filter_confirmed(df: pd.DataFrame, disp_col: str) -> pd.DataFrame:
-    def is_conf(v) -> bool:
-        s = str(v).strip().upper()
-        return s in {"CP", "CONFIRMED"}
-    out = df[df[disp_col].apply(is_conf)].copy()
+    mask = df[disp_col].astype(str).str.strip().str.upper().isin({"CP", "CONFIRMED"})
+    out = df.loc[mask].copy()
     LOG.info(f"Confirmed rows: {len(out)}")
     return out
 
@@ -124,28 +176,70 @@ def detect_tic_column(df: pd.DataFrame) -> str:
 
 
 def extract_tic_list(df_confirmed: pd.DataFrame, tic_col: str, limit: Optional[int]) -> List[int]:
-    ser = (
-        df_confirmed[tic_col]
-        .astype(str)
-        .str.extract(r"(\d+)", expand=False)  # pull digits even if "TIC 123..."
-        .dropna()
-        .astype("int64")
-        .drop_duplicates()
-    )
+    # pull digits even if "TIC 123..."; one native pass each for match, cast and first-seen unique
+    arr = pa.array(df_confirmed[tic_col].astype(str).to_numpy(), type=pa.string())
+    digits = pc.struct_field(pc.extract_regex(arr, pattern=r"(?P<n>\d+)"), [0])
+    ser = pc.unique(pc.drop_null(pc.cast(digits, pa.int64())))
     if limit:
-        ser = ser.head(limit)
-    tics = ser.tolist()
+        ser = ser[:limit]
+    tics = ser.to_pylist()
     LOG.info(f"Selected unique TICs: {len(tics)}")
     return tics
 
 
 # --------- Light curve download & preprocess ---------
+def _search_table(tic_id: int, exptime: Optional[int]):
+    """SPOC search for one TIC as a bare astropy Table (pickles cleanly, unlike SearchResult)."""
+    kwargs = {"exptime": exptime} if exptime is not None else {}
+    return lk.search_lightcurve(f"TIC {tic_id}", mission="TESS", author="SPOC", **kwargs).table
+
+
+_HTTP: Optional[httpx.Client] = None
+
+
+def _init_http_client(workers: int = DEFAULT_WORKERS) -> None:
+    """Build this worker process's HTTP/2 keep-alive client; the pool limit follows --workers."""
+    global _HTTP
+    _HTTP = httpx.Client(http2=True, timeout=MAST_TIMEOUT, follow_redirects=True,
+                         limits=httpx.Limits(max_keepalive_connections=workers * 2))
+
+
+def _http_client() -> httpx.Client:
+    """One keep-alive client per worker process, so sectors after the first skip the TLS handshake."""
+    if _HTTP is None:
+        _init_http_client()
+    return _HTTP
+
+
+def download_product(row, raw_dir: Path) -> Path:
+    """Stream one MAST product to lightkurve's cache layout (raw/mastDownload/...); cached files are reused."""
+    path = raw_dir / "mastDownload" / str(row["obs_collection"]) / str(row["obs_id"]) / str(row["productFilename"])
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".part")
+    with _http_client().stream("GET", MAST_DOWNLOAD_URL, params={"uri": str(row["dataURI"])}) as r:
+        r.raise_for_status()
+        with open(tmp, "wb") as fp:
+            for chunk in r.iter_bytes(1 << 20):
+                fp.write(chunk)
+    os.replace(tmp, path)
+    return path
+
+
+def cached_search(tic_id: int, exptime: Optional[int], raw_dir: Path) -> lk.SearchResult:
+    """search_lightcurve memoized on disk under raw/search_cache; delete that dir to re-query MAST."""
+    search = joblib.Memory(raw_dir / "search_cache", verbose=0).cache(_search_table)
+    return lk.SearchResult(search(int(tic_id), exptime))
+
+
 def process_one_tic_fast(
     tic_id: int,
     lc_out: Path,
     raw_dir: Path,
     prefer_exptime: int = DEFAULT_PREFER_EXPTIME,
     max_sectors: int = DEFAULT_MAX_SECTORS,
+    compression: str = DEFAULT_PARQUET_COMPRESSION,
 ) -> dict:
     """Download 1 SPOC LC (prefer 2-min), quick clean, save 'TIC-<id>.parquet'."""
     try:
@@ -154,16 +248,16 @@ def process_one_tic_fast(
             return {"tic_id": tic_id, "status": "cached"}
 
         # Prefer 2-min cadence; fall back to any SPOC LC
-        sr = lk.search_lightcurve(f"TIC {tic_id}", mission="TESS", author="SPOC", exptime=prefer_exptime)
+        sr = cached_search(tic_id, prefer_exptime, raw_dir)
         if len(sr) == 0:
-            sr = lk.search_lightcurve(f"TIC {tic_id}", mission="TESS", author="SPOC")
+            sr = cached_search(tic_id, None, raw_dir)
             if len(sr) == 0:
                 return {"tic_id": tic_id, "status": "no_lc"}
 
         sr_use = sr[:max_sectors]  # fastest: first match only
 
         # Use local cache for FITS so reruns are instant
-        lcs = [it.download(download_dir=str(raw_dir)) for it in sr_use]
+        lcs = [lk.read(str(download_product(row, raw_dir))) for row in sr_use.table]
         lc = lk.LightCurveCollection(lcs).stitch().remove_nans()
 
         # QUALITY mask (if present) + gentle clean
@@ -177,22 +271,17 @@ def process_one_tic_fast(
         except Exception:
             pass
 
-        df = pd.DataFrame(
-            {
-                "time": np.asarray(lc.time.value, "float64"),
-                "flux": np.asarray(lc.flux.value, "float32"),
-            }
-        )
-        if getattr(lc, "flux_err", None) is not None:
-            df["flux_err"] = np.asarray(lc.flux_err.value, "float32")
-
-        df.to_parquet(out_path, index=False)
-        return {"tic_id": tic_id, "status": "ok", "rows": len(df)}
+        flux_err = lc.flux_err.value if getattr(lc, "flux_err", None) is not None else None
+        rows = write_lightcurve(out_path, lc.time.value, lc.flux.value, flux_err, compression)
+        return {"tic_id": tic_id, "status": "ok", "rows": rows}
     except Exception as e:
         return {"tic_id": tic_id, "status": "error", "error": str(e)}
 
 
-# --------- TIC metadata (safe, per ID) ---------
+# --------- TIC metadata (batched, per-ID fallback) ---------
+TIC_META_CHUNK = 500
+
+
 def fetch_one_tic_meta(tic_id: int) -> pd.DataFrame:
     """Fetch TIC metadata for one ID with a fallback by object name."""
     try:
@@ -210,10 +299,33 @@ def fetch_one_tic_meta(tic_id: int) -> pd.DataFrame:
     return pd.DataFrame()
 
 
-def fetch_tic_meta_parallel(tics: List[int], workers: int = 5) -> pd.DataFrame:
+def fetch_tic_meta_chunk(tic_ids: List[int]) -> pd.DataFrame:
+    """Fetch TIC metadata for a list of IDs in one MAST query; IDs it misses go through fetch_one_tic_meta."""
+    found = pd.DataFrame()
+    try:
+        r = Catalogs.query_criteria(catalog="TIC", ID=[int(t) for t in tic_ids])
+        if len(r) > 0:
+            found = r.to_pandas()
+    except Exception as e:
+        LOG.warning(f"TIC batch query for {len(tic_ids)} IDs failed ({e}); falling back to per-ID queries")
+
+    seen = set()
+    if not found.empty and "ID" in found.columns:
+        seen = set(pd.to_numeric(found["ID"], errors="coerce").dropna().astype(np.int64).tolist())
+    frames = [found] if not found.empty else []
+    for t in tic_ids:
+        if int(t) not in seen:
+            df = fetch_one_tic_meta(t)
+            if not df.empty:
+                frames.append(df)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def fetch_tic_meta_parallel(tics: List[int], workers: int = 5, chunk_size: int = TIC_META_CHUNK) -> pd.DataFrame:
     frames = []
-    with ThreadPoolExecutor(max_workers=workers) as ex:
-        futs = {ex.submit(fetch_one_tic_meta, t): t for t in tics}
+    chunks = [tics[i:i + chunk_size] for i in range(0, len(tics), chunk_size)]
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as ex:
+        futs = {ex.submit(fetch_tic_meta_chunk, c): len(c) for c in chunks}
         for f in as_completed(futs):
             df = f.result()
             if not df.empty:
@@ -251,11 +363,14 @@ def main():
     ap.add_argument("--prefer_exptime", type=int, default=DEFAULT_PREFER_EXPTIME, help="Preferred exposure (s), default 120.")
     ap.add_argument("--max_sectors", type=int, default=DEFAULT_MAX_SECTORS, help="Max sectors per TIC (default: 1).")
     ap.add_argument("--resume", action="store_true", help="Skip TICs already saved as parquet.")
+    ap.add_argument("--parquet_compression", choices=["zstd", "lz4", "snappy"], default=DEFAULT_PARQUET_COMPRESSION,
+                    help="Light-curve parquet codec (default: zstd).")
     ap.add_argument("--labels_only", action="store_true", help="Only write labels (no downloads).")
     args = ap.parse_args()
 
     base = Path(args.outdir)
     raw, proc, lc_out, meta_dir = ensure_dirs(base)
+    lc_index = load_lc_index(lc_out)
 
     # 1) Load TOI & filter confirmed
     df_toi = load_toi_table(args.toi_csv)
@@ -278,15 +393,19 @@ def main():
         # 3) Resume: skip already-saved light curves
         todo = tic_list
         if args.resume:
-            have = {int(p.stem.split("-")[1]) for p in lc_out.glob("TIC-*.parquet")}
+            have = set(lc_index)
             todo = [t for t in tic_list if t not in have]
             LOG.info(f"Resume mode: already have {len(have)}; to download now: {len(todo)}")
 
         # 4) Parallel downloader
         LOG.info(f"Starting downloads with workers={args.workers}, prefer_exptime={args.prefer_exptime}, max_sectors={args.max_sectors}")
         results = []
-        with ThreadPoolExecutor(max_workers=args.workers) as ex:
-            futs = {ex.submit(process_one_tic_fast, t, lc_out, raw, args.prefer_exptime, args.max_sectors): t for t in todo}
+        # Processes, not threads: stitch/flatten and parquet encoding are CPU-bound and would
+        # serialise on the GIL; process_one_tic_fast takes only picklable arguments.
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_http_client,
+                                 initargs=(args.workers,)) as ex:
+            futs = {ex.submit(process_one_tic_fast, t, lc_out, raw, args.prefer_exptime, args.max_sectors,
+                              args.parquet_compression): t for t in todo}
             for f in as_completed(futs):
                 results.append(f.result())
 
@@ -297,8 +416,16 @@ def main():
             LOG.info(f"Download summary: {counts}")
             (meta_dir / "download_log.csv").write_text(res_df.to_csv(index=False))
 
+        # Fold this run's writes into the index; "cached" files were on disk but not yet indexed.
+        for r in results:
+            if r["status"] == "ok":
+                lc_index[r["tic_id"]] = r["rows"]
+            elif r["status"] == "cached" and r["tic_id"] not in lc_index:
+                lc_index[r["tic_id"]] = pq.read_metadata(lc_out / f"TIC-{r['tic_id']}.parquet").num_rows
+        write_lc_index(lc_out, lc_index)
+
     # 5) TIC metadata (for the TICs we truly have on disk)
-    tic_ok = sorted({int(p.stem.split("-")[1]) for p in lc_out.glob("TIC-*.parquet")})
+    tic_ok = sorted(lc_index)
     LOG.info(f"TICs with saved light curves: {len(tic_ok)}")
 
     LOG.info("Fetching TIC metadata (parallel)…")
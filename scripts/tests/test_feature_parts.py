@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import build_features
+
+
+def _row(tic_id: int, snr: float, **meta: float) -> pd.Series:
+    return pd.Series({"tic_id": tic_id, "warning": None, "data_fraction_kept": 1.0, "snr": snr, **meta})
+
+
+def test_parts_merge_sorted_with_parts_winning(tmp_path: Path) -> None:
+    out = tmp_path / "features_all.parquet"
+    pd.DataFrame([_row(5, 1.0), _row(1, 1.0)]).to_parquet(out)
+    parts_dir = tmp_path / "features_all.parts"
+
+    parts = build_features._FeatureParts(parts_dir)
+    parts.add([_row(3, 2.0, tmag=9.5)])
+    parts.checkpoint()
+    parts.add([_row(5, 7.0), pd.Series({"tic_id": 2, "warning": "insufficient_data", "data_fraction_kept": 0.1})])
+    parts.checkpoint()
+    assert [p.name for p in build_features._part_files(parts_dir)] == ["part-00000.parquet", "part-00001.parquet"]
+
+    feats = build_features._write_combined(out, parts_dir, out)
+
+    assert feats["tic_id"].tolist() == [1, 2, 3, 5]
+    assert feats.loc[feats["tic_id"] == 5, "snr"].item() == 7.0
+    assert feats.loc[feats["tic_id"] == 2, "warning"].item() == "insufficient_data"
+    assert np.isnan(feats.loc[feats["tic_id"] == 2, "snr"].item())
+    # tmag is kept because one TIC has it; the other meta columns are null throughout.
+    assert "tmag" in feats.columns and "teff" not in feats.columns
+    assert not build_features._part_files(parts_dir)
+    pd.testing.assert_frame_equal(pd.read_parquet(out), feats)
+
+
+def test_unclosed_part_is_not_merged(tmp_path: Path) -> None:
+    parts_dir = tmp_path / "features_all.parts"
+    parts = build_features._FeatureParts(parts_dir)
+    parts.add([_row(1, 1.0)])
+    parts.checkpoint()
+    parts.add([_row(2, 1.0)] * build_features.FEATURES_ROW_GROUP)  # flushed, but never checkpointed
+
+    assert build_features._done_ids(build_features._part_files(parts_dir)) == {1}
+    build_features._FeatureParts(parts_dir)  # a resumed run drops the stale temporary part
+    assert not list(parts_dir.glob("*.tmp"))
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import httpx
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import fetch_tess_lightcurve as fetch
+
+
+def _frame(n: int = 50, with_err: bool = True) -> pd.DataFrame:
+    frame = pd.DataFrame({"time": np.linspace(1500.0, 1527.0, n), "flux": np.ones(n), "flux_err": np.full(n, 1e-3)})
+    return frame if with_err else frame.drop(columns="flux_err")
+
+
+def test_arrow_payload_round_trips_with_shared_schema() -> None:
+    frames = [_frame(), _frame(n=30, with_err=False)]
+    batches = list(pa.ipc.open_stream(fetch._arrow_payload(frames)))
+
+    assert [batch.num_rows for batch in batches] == [50, 30]
+    assert batches[0].schema.names == ["time", "flux", "flux_err"]
+    np.testing.assert_array_equal(batches[0].column("time").to_numpy(), frames[0]["time"].to_numpy())
+    assert batches[1].column("flux_err").null_count == 30
+
+
+def test_call_backend_batch_splits_and_caps_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    sizes, timeouts = [], []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/predict/from_lightcurves"
+        n = len(list(pa.ipc.open_stream(request.content)))
+        sizes.append(n)
+        return httpx.Response(200, json={"results": [{"index": i, "prediction": None, "error": None} for i in range(n)]})
+
+    real_client = httpx.Client
+
+    def client(timeout: float) -> httpx.Client:
+        timeouts.append(timeout)
+        return real_client(transport=httpx.MockTransport(handler), timeout=timeout)
+
+    monkeypatch.setattr(fetch.httpx, "Client", client)
+
+    results = fetch.call_backend_batch([_frame() for _ in range(3)], "http://backend", max_batch=2)
+    assert [item["index"] for item in results] == [0, 1, 2]
+    assert sizes == [2, 1]
+
+    fetch.call_backend_batch([_frame()] * (fetch.MAX_BACKEND_BATCH + 1), "http://backend", max_batch=1000)
+    assert sizes[2:] == [fetch.MAX_BACKEND_BATCH, 1]
+    assert timeouts == [120.0, fetch.BATCH_TIMEOUT_CAP_S]
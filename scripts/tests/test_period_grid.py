@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import numpy as np
+
+import build_features
+
+
+OFIR_CFG = {
+    "bls_period_days_min": 0.5,
+    "bls_period_days_max": 30.0,
+    "bls_n_periods": 2000,
+    "period_grid": "ofir",
+}
+
+
+def test_ofir_grid_trial_count_for_one_sector() -> None:
+    # Ofir (2014) eq. 5 for a 27 d baseline over 0.5-30 d at oversample 3 gives about 3000 trials.
+    periods = build_features._period_grid(OFIR_CFG, 27.0)
+
+    assert 2900 <= periods.size <= 3100
+    assert np.isclose(periods[0], 0.5) and np.isclose(periods[-1], 30.0)
+    assert np.all(np.diff(periods) > 0)
+
+
+def test_ofir_grid_is_uniform_in_cube_root_frequency() -> None:
+    periods = build_features._period_grid(OFIR_CFG, 27.0)
+    steps = -np.diff((1.0 / periods) ** (1 / 3))
+
+    expected = build_features.OFIR_A_SUN / (3 * 27.0 * build_features.OFIR_OVERSAMPLE)
+    np.testing.assert_allclose(steps, steps[0], rtol=1e-9)
+    assert steps[0] <= expected
+
+
+def test_ofir_grid_scales_with_baseline() -> None:
+    # Trials grow linearly with the baseline: two sectors need twice the grid.
+    one = build_features._period_grid(OFIR_CFG, 27.0).size
+    two = build_features._period_grid(OFIR_CFG, 54.0).size
+    assert abs(two - 2 * one) <= 2
+
+
+def test_linear_grid_when_not_ofir() -> None:
+    periods = build_features._period_grid({**OFIR_CFG, "period_grid": "linear"}, 27.0)
+    np.testing.assert_array_equal(periods, np.linspace(0.5, 30.0, 2000))